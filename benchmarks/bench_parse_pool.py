@@ -0,0 +1,97 @@
+# Parse offload benchmark: in-process parsing vs parser threads vs a process pool
+#
+# Usage (from the project root):
+#     python benchmarks/fixtures.py        # (re)generate the saved fixture pages
+#     python benchmarks/bench_parse_pool.py [--pages N] [--processes P]
+#
+# The saved search and detail pages are parsed N times each way and the
+# throughput (pages/sec) is compared:
+#   in-process:  parser functions called one after another on the main thread
+#   threads:     P parser threads (what PARSE_WORKERS does; serialized by the GIL)
+#   processes:   a ParsePool of P warm workers, pages pickled through the pool's pipe
+#   shared-mem:  the same pool, pages handed over through shared memory
+# Every variant must return exactly the records the in-process parser returns.
+# Process pools only pay off with more than one core; the pool start-up time
+# is reported separately and not counted in the throughput.
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from src import parser
+from src.parse_pool import ParsePool
+
+
+def load_work(pages):
+    """Returns `pages` (function name, html) items cycling over the saved search and detail pages."""
+    fixture_pages = ([("parse_job_listings", page) for page in fixtures.load_fixture_pages("search_page")] +
+                     [("parse_job_details", page) for page in fixtures.load_fixture_pages("detail_page")])
+    return [fixture_pages[i % len(fixture_pages)] for i in range(pages)] if fixture_pages else []
+
+
+def run_in_process(work):
+    return [getattr(parser, func_name)(html_content) for func_name, html_content in work]
+
+
+def run_threads(work, threads):
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(lambda item: getattr(parser, item[0])(item[1]), work))
+
+
+def run_pool(pool, work):
+    handles = []
+    results = []
+    for func_name, html_content in work: # Same in-flight bound as ParsePool.map
+        handles.append(pool.submit(func_name, html_content))
+        if len(handles) >= 2 * pool.workers:
+            results.append(pool.result(handles.pop(0)))
+    results.extend(pool.result(handle) for handle in handles)
+    return results
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark process-pool parse offload")
+    arg_parser.add_argument("--pages", type=int, default=400, help="Pages parsed by each variant")
+    arg_parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(),
+                            help="Parser threads / worker processes (default: CPU count)")
+    args = arg_parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    work = load_work(args.pages)
+    if not work:
+        sys.exit(f"No fixture pages in {fixtures.FIXTURES_DIR}; run benchmarks/fixtures.py first.")
+    page_kib = sum(len(html_content) for _, html_content in work) / len(work) / 1024
+    print(f"{len(work)} pages (mean {page_kib:.0f} KiB), {args.processes} thread(s)/process(es), "
+          f"{multiprocessing.cpu_count()} CPU(s), tree builder: {parser.HTML_PARSER}")
+
+    start = time.perf_counter()
+    expected = run_in_process(work)
+    results = {"in-process": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    assert run_threads(work, args.processes) == expected, "threaded parse output differs"
+    results["threads"] = time.perf_counter() - start
+
+    for name, use_shared_memory in (("processes", False), ("shared-mem", True)):
+        start = time.perf_counter()
+        with ParsePool(args.processes, use_shared_memory=use_shared_memory) as pool:
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            assert run_pool(pool, work) == expected, f"{name} parse output differs"
+            results[name] = time.perf_counter() - start
+        print(f"{name} pool start-up: {startup * 1000:.0f} ms")
+
+    print(f"{'variant':<12} {'pages/sec':>10} {'speedup':>8}")
+    for name, elapsed in results.items():
+        print(f"{name:<12} {len(work) / elapsed:>10.1f} {results['in-process'] / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Parser benchmark: legacy per-card find() parsing vs the single-parse fast path
+#
+# Usage (from the project root):
+#     python benchmarks/fixtures.py        # (re)generate the saved fixture pages
+#     python benchmarks/bench_parser.py [--repeat N]
+#
+# For every saved search page this measures the time and memory allocations
+# needed to get both the job listings and the next page link:
+#   before: legacy parse_job_listings + find_next_page_url (two html.parser trees)
+#   after:  parser.parse_search_page (one tree, lxml when installed)
+
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from benchmarks import legacy_parser
+from src import parser
+
+BASE_URL = "https://www.indeed.com"
+
+
+def legacy_search_page(html_content):
+    return (legacy_parser.parse_job_listings(html_content),
+            legacy_parser.find_next_page_url(html_content, BASE_URL))
+
+
+def fast_search_page(html_content):
+    return parser.parse_search_page(html_content, BASE_URL)
+
+
+def measure(func, pages, repeat):
+    """Returns (mean ms per page, peak traced KiB while parsing one page) for `func`."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - start
+
+    peaks = []
+    for page in pages:
+        tracemalloc.start()
+        func(page)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    return elapsed * 1000 / (repeat * len(pages)), max(peaks) / 1024
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark search page parsing")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions over the fixture set")
+    arg_parser.add_argument("--html-parser", choices=("lxml", "html.parser"),
+                            help="Force the fast path's tree builder (default: best available)")
+    args = arg_parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    pages = fixtures.load_fixture_pages("search_page")
+    if not pages:
+        sys.exit(f"No fixture pages in {fixtures.FIXTURES_DIR}; run benchmarks/fixtures.py first.")
+
+    if args.html_parser:
+        parser.HTML_PARSER = args.html_parser
+    # The fast path must not change a single record
+    for page in pages:
+        assert fast_search_page(page) == legacy_search_page(page), "fast path output differs from legacy parser"
+
+    print(f"{len(pages)} fixture pages, {args.repeat} repetitions, fast path tree builder: {parser.HTML_PARSER}")
+    print(f"{'variant':<10} {'ms/page':>10} {'peak KiB':>10}")
+    results = {}
+    for name, func in (("before", legacy_search_page), ("after", fast_search_page)):
+        results[name] = measure(func, pages, args.repeat)
+        ms, peak_kib = results[name]
+        print(f"{name:<10} {ms:>10.2f} {peak_kib:>10.0f}")
+    print(f"speedup: {results['before'][0] / results['after'][0]:.2f}x, "
+          f"peak memory: {results['after'][1] / results['before'][1]:.2f}x of before")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Job record memory benchmark: one dict per job vs JobPosting (__slots__ + interning)
+#
+# Usage (from the project root):
+#     python benchmarks/bench_records.py [--records N]
+#
+# Builds N synthetic job records (default 100,000) the way the parser does, as
+# fresh strings per field (get_text never returns a shared object), once as
+# dicts and once as JobPosting records, with and without a full_description,
+# and reports the memory they hold (tracemalloc) and the time to build them.
+# Company, location and date values repeat across records like on a real
+# results page, which is what interning saves.
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from src.records import JobPosting
+
+
+def _fresh(text):
+    """Returns an equal string that is a new object, like BeautifulSoup's get_text()."""
+    return (" " + text)[1:]
+
+
+def raw_fields(count, details, seed=0):
+    """Yields the field values of `count` synthetic jobs."""
+    rng = random.Random(seed)
+    description = " ".join(fixtures._sentence(rng, 40) for _ in range(8)) if details else None
+    for i in range(count):
+        fields = {
+            "title": f"{rng.choice(fixtures.TITLES)} #{i}",
+            "company": _fresh(rng.choice(fixtures.COMPANIES)),
+            "location": _fresh(rng.choice(fixtures.LOCATIONS)),
+            "summary": fixtures._sentence(rng, 30),
+            "date_posted": _fresh(rng.choice(fixtures.DATES)),
+            "url": f"https://www.indeed.com/rc/clk?jk={i:016x}&from=serp&vjs=3",
+        }
+        if details:
+            fields["full_description"] = f"{description} ({i})"
+        yield fields
+
+
+def measure(build, count, details):
+    """Returns (traced bytes held by the built records, seconds to build them)."""
+    values = list(raw_fields(count, details)) # Generated up front so only the records are measured
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [build(fields) for fields in values]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current, elapsed
+
+
+def as_dict(fields):
+    return {key: _fresh(value) for key, value in fields.items()}
+
+
+def as_posting(fields):
+    return JobPosting(**{key: _fresh(value) for key, value in fields.items()})
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark job record memory")
+    arg_parser.add_argument("--records", type=int, default=100_000, help="Records built per variant")
+    args = arg_parser.parse_args(argv)
+
+    print(f"{args.records:,} records")
+    print(f"{'variant':<28} {'MiB':>8} {'bytes/record':>13} {'build ms':>9}")
+    for details in (False, True):
+        results = {}
+        for name, build in (("dict", as_dict), ("JobPosting", as_posting)):
+            results[name] = measure(build, args.records, details)
+            held, elapsed = results[name]
+            label = f"{name}{' + full_description' if details else ''}"
+            print(f"{label:<28} {held / 2**20:>8.1f} {held / args.records:>13,.0f} {elapsed * 1000:>9.0f}")
+        print(f"  JobPosting holds {results['JobPosting'][0] / results['dict'][0]:.2f}x the memory of dicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# End-to-end scraping benchmark against the local mock job board
+#
+# Usage (from the project root):
+#     python benchmarks/bench_scrape.py [--pages 20] [--latency 0.05] [--timeout-rate 0.02] [--details]
+#     python benchmarks/bench_scrape.py --save-baseline     # record benchmarks/baseline.json
+#     python benchmarks/bench_scrape.py --rate-limit 1 --server-rate 6 [--fixed-rate]   # adaptive vs fixed limiter
+#     python benchmarks/bench_scrape.py --backend auto --rate-limit 4 --max-rate 8 --server-rate 2
+#                                                        # 429 handling of the default backend (retries, backoff)
+#     python benchmarks/bench_scrape.py --backend selenium [--slow-browser]            # fast vs full browser mode
+#
+# Scrapes a benchmarks/mock_server.MockJobBoard (over the HTTP backend by default) with
+# config.BASE_URL pointed at it, then measures the CPU cost of the parser on
+# the saved fixtures. Reports pages/sec, jobs/sec, p50/p99 page latency, peak
+# RSS, parse CPU time per page and completeness (share of the board's jobs that
+# were scraped despite timeouts and 429s), and compares them against the baseline file:
+# any metric worse than the baseline by more than --tolerance is reported as a
+# regression and the script exits with status 1.
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from benchmarks.mock_server import MockJobBoard
+from src import config
+from src import metrics
+from src import parser
+from src.enrich import DetailCache, DetailEnricher
+from src.scraper import JobScraper
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Metric name -> True if higher is better
+METRICS = {
+    "pages_per_sec": True,
+    "jobs_per_sec": True,
+    "completeness": True,
+    "p50_page_ms": False,
+    "p99_page_ms": False,
+    "peak_rss_mib": False,
+    "cpu_parse_job_listings_ms": False,
+    "cpu_find_next_page_url_ms": False,
+    "cpu_parse_job_details_ms": False,
+}
+
+
+def percentile(values, pct):
+    """Returns the `pct` percentile of `values` (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def peak_rss_mib():
+    """Returns the peak resident set size of this process in MiB, or 0 if unknown."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # bytes on macOS, KiB elsewhere
+
+
+def browser_rss_mib():
+    """Returns the resident memory of this process's descendants (chromedriver, Chrome) in MiB.
+
+    Linux only (reads /proc); returns 0 elsewhere or when no browser is running.
+    """
+    children = {}
+    try:
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(pid))
+            except (OSError, IndexError, ValueError):
+                continue # Process exited while we were looking
+    except OSError:
+        return 0.0
+    total_kib = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                total_kib += next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+        except OSError:
+            continue
+    return total_kib / 1024
+
+
+def run_scrape(args):
+    """Scrapes the mock board and returns the throughput and latency metrics."""
+    board = MockJobBoard(pages=args.pages, jobs_per_page=args.jobs_per_page, latency=args.latency,
+                         jitter=args.jitter, timeout_rate=args.timeout_rate, stall=args.client_timeout + 0.5,
+                         max_rate=args.server_rate, recorded=args.recorded, seed=args.seed)
+    config.PAGE_LOAD_TIMEOUT = args.client_timeout
+    config.MAX_PAGES = args.pages + 1 # One empty page marks the end of the results
+    config.HOST_RATE_LIMIT = args.rate_limit
+    config.DETAIL_RATE_LIMIT = args.rate_limit
+    config.ADAPTIVE_RATE_LIMIT = not args.fixed_rate
+    config.MAX_HOST_RATE = args.max_rate
+    config.RATE_INCREASE = args.rate_increase
+    config.FAST_BROWSER = not args.slow_browser
+    metrics.REGISTRY.reset()
+
+    latencies = []
+    with board, tempfile.TemporaryDirectory() as cache_dir:
+        config.BASE_URL = board.search_url
+        scraper = JobScraper(max_workers=args.workers, backend=args.backend)
+        fetch = scraper.fetcher.fetch
+
+        def timed_fetch(url, is_complete=None, ready_selectors=None):
+            start = time.perf_counter()
+            try:
+                return fetch(url, is_complete, ready_selectors)
+            finally:
+                if "/jobs" in url:
+                    latencies.append(time.perf_counter() - start) # Timed-out pages included
+
+        scraper.fetcher.fetch = timed_fetch
+        enricher = DetailEnricher(scraper, DetailCache(os.path.join(cache_dir, "details.sqlite3"))) if args.details else None
+        try:
+            jobs = 0
+            start = time.perf_counter()
+            for page_jobs in scraper.iter_job_pages():
+                if enricher:
+                    enricher.enrich(page_jobs)
+                jobs += len(page_jobs)
+            elapsed = time.perf_counter() - start
+            browser_mib = browser_rss_mib() # Before the browsers are shut down
+        finally:
+            if enricher:
+                enricher.close()
+            scraper.close_driver()
+
+    return {
+        "pages_per_sec": len(latencies) / elapsed,
+        "jobs_per_sec": jobs / elapsed,
+        "p50_page_ms": percentile(latencies, 50) * 1000,
+        "p99_page_ms": percentile(latencies, 99) * 1000,
+        "completeness": jobs / (board.pages * board.jobs_per_page),
+        "browser_rss_mib": browser_mib,
+        "jobs": jobs,
+        "pages": len(latencies),
+        "timeouts": board.stalled,
+        "rate_limited": board.rate_limited,
+        "retries": metrics.REGISTRY.summary()["counters"].get("fetch_retries_total", {}),
+        "backoffs": sum(metrics.REGISTRY.summary()["counters"].get("rate_backoffs_total", {}).values()),
+        "elapsed_s": elapsed,
+    }
+
+
+def measure_parse_cpu(repeat, rounds=5):
+    """Returns the CPU milliseconds per page spent by each parser entry point on the fixtures.
+
+    Each entry point is timed over `rounds` rounds of `repeat` passes and the
+    fastest round is kept, which filters out noise from other processes.
+    Garbage collection is paused while timing, as in `timeit`, and run between rounds.
+    """
+    search_pages = fixtures.load_fixture_pages("search_page")
+    detail_pages = fixtures.load_fixture_pages("detail_page")
+    if not search_pages or not detail_pages:
+        sys.exit(f"No fixture pages in {fixtures.FIXTURES_DIR}; run benchmarks/fixtures.py first.")
+    cases = {
+        "parse_job_listings": (parser.parse_job_listings, [(page,) for page in search_pages]),
+        "find_next_page_url": (parser.find_next_page_url, [(page, "https://www.indeed.com") for page in search_pages]),
+        "parse_job_details": (parser.parse_job_details, [(page,) for page in detail_pages]),
+    }
+    results = {}
+    try:
+        for name, (func, calls) in cases.items():
+            best = float("inf")
+            for _ in range(rounds):
+                gc.collect()
+                gc.disable()
+                start = time.process_time()
+                for _ in range(repeat):
+                    for call_args in calls:
+                        func(*call_args)
+                best = min(best, time.process_time() - start)
+                gc.enable()
+            results[f"cpu_{name}_ms"] = best * 1000 / (repeat * len(calls))
+    finally:
+        gc.enable()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Prints each metric next to its baseline value and returns the names of regressed metrics."""
+    regressions = []
+    print(f"{'metric':<28} {'current':>12} {'baseline':>12} {'change':>9}")
+    for name, higher_is_better in METRICS.items():
+        current = results[name]
+        previous = baseline.get("metrics", {}).get(name)
+        if not previous:
+            print(f"{name:<28} {current:>12.2f} {'-':>12}")
+            continue
+        change = (current - previous) / previous
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<28} {current:>12.2f} {previous:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark scraping against a local mock job board")
+    arg_parser.add_argument("--pages", type=int, default=20, help="Pagination depth of the mock board")
+    arg_parser.add_argument("--jobs-per-page", type=int, default=15, help="Job cards per synthetic page")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Server response latency in seconds")
+    arg_parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency of up to this many seconds")
+    arg_parser.add_argument("--timeout-rate", type=float, default=0.05, help="Fraction of responses that stall past the client timeout")
+    arg_parser.add_argument("--client-timeout", type=float, default=1.0, help="Page load timeout used by the scraper")
+    arg_parser.add_argument("--backend", choices=("http", "selenium", "auto"), default="http",
+                            help="Fetch backend to benchmark (default: %(default)s, which needs no browser; selenium needs "
+                                 "Chrome, and so do auto's escalations, e.g. of the empty page past the last one)")
+    arg_parser.add_argument("--slow-browser", action="store_true",
+                            help="Disable fast browser mode (full page loads, images and fonts, whole page_source)")
+    arg_parser.add_argument("--workers", type=int, default=config.MAX_WORKERS, help="Concurrent page workers")
+    arg_parser.add_argument("--rate-limit", type=float, default=0, help="Starting per-host requests/sec limit (0 disables)")
+    arg_parser.add_argument("--max-rate", type=float, default=config.MAX_HOST_RATE, help="Upper bound of the adaptive rate")
+    arg_parser.add_argument("--rate-increase", type=float, default=config.RATE_INCREASE,
+                            help="Requests/sec the adaptive rate gains per second of healthy responses")
+    arg_parser.add_argument("--fixed-rate", action="store_true", help="Keep the rate limit fixed instead of adapting it")
+    arg_parser.add_argument("--server-rate", type=float, help="Requests/sec above which the mock board answers HTTP 429")
+    arg_parser.add_argument("--details", action="store_true", help="Also fetch and parse every job's detail page")
+    arg_parser.add_argument("--recorded", action="store_true", help="Serve the saved fixture pages instead of synthetic ones")
+    arg_parser.add_argument("--repeat", type=int, default=10, help="Passes over the fixtures per parse CPU measurement round")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Seed for latency, stalls and page content")
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline results file (default: %(default)s)")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file")
+    arg_parser.add_argument("--tolerance", type=float, default=0.20,
+                            help="Allowed relative change for the worse before a metric is a regression")
+    args = arg_parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    scenario = {key: getattr(args, key) for key in ("backend", "slow_browser", "pages", "jobs_per_page", "latency", "jitter", "timeout_rate",
+                                                      "client_timeout", "workers", "rate_limit", "max_rate", "rate_increase", "fixed_rate",
+                                                      "server_rate", "details", "recorded", "seed")}
+    results = run_scrape(args)
+    results["peak_rss_mib"] = peak_rss_mib() # Before the parse loop, which holds many trees at once
+    results.update(measure_parse_cpu(args.repeat))
+    retries = ", ".join(f"{reason.split('=', 1)[1]} {count}" for reason, count in sorted(results["retries"].items())) or "none"
+    print(f"{results['pages']} page loads ({results['timeouts']} timed out, {results['rate_limited']} rate limited), "
+          f"{results['jobs']} jobs in {results['elapsed_s']:.2f} s with {args.workers} worker(s)")
+    print(f"Retries by reason: {retries}; rate backoffs: {results['backoffs']}")
+    if args.backend != "http":
+        print(f"Browser processes resident memory at the end of the run: {results['browser_rss_mib']:.0f} MiB")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("scenario") != scenario:
+            print(f"Warning: baseline was recorded with a different scenario: {baseline.get('scenario')}")
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"scenario": scenario, "metrics": {name: round(results[name], 3) for name in METRICS},
+                       "python": sys.version.split()[0], "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+                      f, indent=4)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Output format round-trip check: multi-page writes through every sink in sinks.FORMATS
+#
+# Usage (from the project root):
+#     python benchmarks/check_sinks.py [--pages N]
+#
+# Writes N pages of jobs, each page bringing new companies, locations and dates
+# (the case that breaks single-dictionary formats), through every registered
+# format, then reads each file back and checks that it holds exactly the
+# records written, in order. Sinks are opened like a --timestamp run with
+# FSYNC_POLICY="batch": the file names must keep the format's full extension,
+# and line-based formats' .part files must hold every page written so far.
+# Formats whose optional dependency is missing are skipped. Exits with status 1
+# if any format fails.
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import config
+from src import sinks
+from src.records import JobPosting
+
+# Formats whose unfinished .part file can be read back (no closing bracket or footer needed)
+PARTIAL_FORMATS = ("csv", "jsonl", "jsonl.zst")
+
+
+def make_pages(pages, jobs_per_page=3):
+    """Returns `pages` lists of jobs whose low-cardinality fields change from page to page."""
+    return [[JobPosting(title=f"Job {page}-{i}", company=f"Company {page}", location=f"City {page % 2}-{i}",
+                        summary=f"Summary with \"quotes\", commas and ünïcödé {page}-{i}",
+                        date_posted=f"{page} days ago", url=f"https://example.com/viewjob?jk={page:04d}{i:03d}",
+                        full_description=f"Line one\nline two {page}-{i}")
+             for i in range(jobs_per_page)]
+            for page in range(pages)]
+
+
+def read_records(fmt, path):
+    """Reads an output file back as a list of dicts of strings."""
+    if fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+    if fmt == "json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    if fmt == "jsonl.zst":
+        import zstandard
+
+        with open(path, "rb") as f:
+            text = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+        return [json.loads(line) for line in text.splitlines()]
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path).to_pylist()
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        with open(path, "rb") as f:
+            return pa.ipc.open_file(f).read_all().to_pylist()
+    raise ValueError(f"No reader for format {fmt!r}")
+
+
+def check_format(fmt, pages, include_details):
+    """Writes `pages` through one format and returns None if the round trip matches, else an error message."""
+    try:
+        sink, = sinks.open_sinks([fmt], include_details, timestamped=True)
+    except ImportError as e:
+        return f"skipped ({e})"
+    filename = getattr(config, sinks.FORMATS[fmt][1])
+    name = os.path.basename(sink.path)
+    if not (name.endswith(f".{fmt}") and name.startswith(filename[:-len(fmt) - 1] + "_")):
+        return f"FAILED: timestamped file name {name} does not keep the .{fmt} extension of {filename}"
+    expected = [{field: job.get(field, "N/A") for field in sink.fields} for page_jobs in pages for job in page_jobs]
+    try:
+        written = 0
+        for page_jobs in pages:
+            sink.write(page_jobs)
+            written += len(page_jobs)
+            if fmt in PARTIAL_FORMATS and read_records(fmt, sink.part_path) != expected[:written]:
+                sink.abort()
+                return f"FAILED: {sink.part_path} does not hold the {written} records synced so far"
+        sink.close()
+    except Exception as e:
+        sink.abort()
+        return f"FAILED while writing: {type(e).__name__}: {e}"
+    actual = read_records(fmt, sink.path)
+    if actual != expected:
+        return f"FAILED: read back {len(actual)} records that differ from the {len(expected)} written"
+    return None
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Check multi-page writes through every output format")
+    arg_parser.add_argument("--pages", type=int, default=5, help="Pages written per format")
+    args = arg_parser.parse_args(argv)
+    logging.disable(logging.CRITICAL)
+
+    pages = make_pages(args.pages)
+    failures = 0
+    with tempfile.TemporaryDirectory() as output_dir:
+        config.OUTPUT_DIR = output_dir
+        config.FSYNC_POLICY = "batch"
+        for include_details in (False, True):
+            for fmt in sinks.FORMATS:
+                error = check_format(fmt, pages, include_details)
+                label = f"{fmt}{' + details' if include_details else ''}"
+                print(f"{label:<22} {error or 'ok'}")
+                failures += bool(error) and error.startswith("FAILED")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
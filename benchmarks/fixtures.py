@@ -0,0 +1,124 @@
+# Synthetic job board pages used by the benchmarks
+#
+# The markup mimics an Indeed search results page closely enough to exercise
+# every selector in src/parser.py: job cards with nested title/company/location/
+# summary/date elements, page chrome around the results, and a "Next" link.
+# Run this module directly to regenerate the saved fixture pages.
+
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "N/A"]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "San Francisco, CA", "Berlin", "London"]
+TITLES = ["Python Developer", "Senior Python Engineer", "Backend Developer (Python)", "Data Engineer",
+          "Software Engineer, Platform", "Machine Learning Engineer", "Django Developer"]
+DATES = ["Just posted", "Today", "1 day ago", "3 days ago", "30+ days ago"]
+WORDS = ("build maintain scalable services python django flask apis data pipelines cloud aws team "
+         "collaborate design review testing deploy monitor performance reliability customers").split()
+
+
+def _sentence(rng, words=18):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def job_key(page_num, index):
+    """Returns a stable job key for the index-th job on a results page."""
+    return f"{page_num:04d}{index:03d}abcdef"[:16]
+
+
+def render_job_card(rng, key, base_url=""):
+    """Renders a single job card."""
+    title = rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    company_html = "" if company == "N/A" else f'<span class="companyName">{company}</span>'
+    return f"""
+<div class="job_seen_beacon cardOutline tapItem">
+  <table class="jobCard_mainContent" role="presentation"><tbody><tr><td class="resultContent">
+    <div class="heading4 color-text-primary singleLineTitle tapItem-gutter">
+      <h2 class="jobTitle jobTitle-newJob css-mr1oe7"><a data-jk="{key}" href="{base_url}/rc/clk?jk={key}&amp;from=serp&amp;vjs=3" class="jcs-JobTitle">
+        <span title="{title}">{title}</span></a></h2>
+    </div>
+    <div class="heading6 company_location tapItem-gutter companyInfo">
+      {company_html}
+      <div class="companyLocation">{rng.choice(LOCATIONS)}</div>
+    </div>
+    <div class="heading6 tapItem-gutter metadataContainer">
+      <div class="metadata salary-snippet-container"><div class="attribute_snippet">${rng.randint(80, 180)},000 a year</div></div>
+    </div>
+  </td></tr></tbody></table>
+  <table class="jobCardShelfContainer" role="presentation"><tbody><tr><td>
+    <div class="job-snippet"><ul><li>{_sentence(rng)}</li><li>{_sentence(rng)}</li></ul></div>
+    <div class="summary">{_sentence(rng, 30)}</div>
+    <span class="date">{rng.choice(DATES)}</span>
+  </td></tr></tbody></table>
+</div>"""
+
+
+def render_search_page(page_num=0, jobs_per_page=15, has_next=True, base_url="", seed=None):
+    """Renders a search results page.
+
+    Args:
+        page_num (int): Zero-based page number (drives job keys and the Next link).
+        jobs_per_page (int): Number of job cards on the page.
+        has_next (bool): Whether to include a "Next" pagination link.
+        base_url (str): Prefix for job links (empty keeps them relative like Indeed).
+        seed (int, optional): Random seed; defaults to the page number for stable output.
+
+    Returns:
+        str: The page HTML.
+    """
+    rng = random.Random(page_num if seed is None else seed)
+    cards = "".join(render_job_card(rng, job_key(page_num, i), base_url) for i in range(jobs_per_page))
+    nav_links = "".join(f'<li><a href="/jobs?q=python&amp;start={n * 10}" aria-label="{n + 1}">{n + 1}</a></li>'
+                        for n in range(max(0, page_num - 2), page_num + 3))
+    next_link = (f'<li><a href="/jobs?q=python&amp;start={(page_num + 1) * 10}" aria-label="Next">Next</a></li>'
+                 if has_next else "")
+    filler = "".join(f'<div class="gnav-item"><a href="/career/{w}">{w}</a></div>' for w in WORDS)
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Python Developer Jobs - Remote</title>
+<link rel="stylesheet" href="/static/main.css"><script>window.mosaic = {{"providerData": {{}}}};</script></head>
+<body>
+<header id="gnav-main-container"><nav>{filler}</nav></header>
+<main><div id="resultsCol"><div id="mosaic-provider-jobcards"><ul class="jobsearch-ResultsList">
+{cards}
+</ul></div>
+<nav role="navigation" aria-label="pagination"><ul class="pagination-list">{nav_links}{next_link}</ul></nav>
+</div></main>
+<footer><p>{_sentence(rng, 40)}</p>{filler}</footer>
+<script>{"var x = 1;" * 200}</script>
+</body></html>"""
+
+
+def render_detail_page(key="0000000abcdef", seed=0):
+    """Renders a job detail page with a full description."""
+    rng = random.Random(seed)
+    paragraphs = "".join(f"<p>{_sentence(rng, 40)}</p>" for _ in range(8))
+    bullets = "".join(f"<li>{_sentence(rng, 10)}</li>" for _ in range(10))
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{rng.choice(TITLES)} - {key}</title></head>
+<body><div class="jobsearch-ViewJobLayout">
+<h1 class="jobsearch-JobInfoHeader-title">{rng.choice(TITLES)}</h1>
+<div id="jobDescriptionText" class="jobsearch-jobDescriptionText">{paragraphs}<ul>{bullets}</ul></div>
+</div></body></html>"""
+
+
+def load_fixture_pages(prefix="search_page"):
+    """Loads the saved fixture pages whose file names start with `prefix`."""
+    pages = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith(prefix) and name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+                pages.append(f.read())
+    return pages
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for page_num in range(3):
+        with open(os.path.join(FIXTURES_DIR, f"search_page_{page_num + 1}.html"), "w", encoding="utf-8") as f:
+            f.write(render_search_page(page_num, has_next=page_num < 2))
+    with open(os.path.join(FIXTURES_DIR, "detail_page_1.html"), "w", encoding="utf-8") as f:
+        f.write(render_detail_page())
+    print(f"Fixtures written to {FIXTURES_DIR}")
@@ -0,0 +1,172 @@
+# Local mock job board for offline benchmarks
+#
+# Serves synthetic (or recorded fixture) search result and detail pages over
+# HTTP on 127.0.0.1, with configurable latency, pagination depth and an
+# occasional stalled response that makes the client time out, and optionally
+# answers HTTP 429 when requests arrive faster than a set rate. Point
+# config.BASE_URL at `MockJobBoard.search_url` to scrape it like the real site:
+#
+#     with MockJobBoard(pages=10, latency=0.05) as board:
+#         config.BASE_URL = board.search_url
+#         ...
+
+import collections
+import http.server
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import fixtures
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real site
+
+    def do_GET(self):
+        board = self.server.board
+        url = urlparse(self.path)
+        if board._over_rate():
+            self._send(429, b"Too Many Requests")
+            return
+        board._delay(self.path)
+        if url.path == "/jobs":
+            start = int(parse_qs(url.query).get("start", ["0"])[0])
+            body = board.render_search_page(start // 10)
+        elif url.path in ("/rc/clk", "/viewjob"):
+            body = board.render_detail_page(parse_qs(url.query).get("jk", [""])[0])
+        else:
+            self.send_error(404)
+            return
+        self._send(200, body.encode("utf-8"))
+
+    def _send(self, status, payload):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True # The client gave up on a stalled response
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+
+class MockJobBoard:
+    """Threaded HTTP server imitating the job board's search and detail pages."""
+
+    def __init__(self, pages=10, jobs_per_page=15, latency=0.05, jitter=0.0, timeout_rate=0.0,
+                 stall=None, max_rate=None, recorded=False, seed=0):
+        """
+        Args:
+            pages (int): Pagination depth; pages past it have no results.
+            jobs_per_page (int): Job cards on each synthetic search page.
+            latency (float): Seconds each response is delayed.
+            jitter (float): Extra uniformly random delay of up to `jitter` seconds.
+            timeout_rate (float): Fraction of requests that stall for `stall` seconds.
+            stall (float, optional): Duration of a stalled response; set it above the
+                client timeout to provoke timeouts. Defaults to 10 seconds.
+            max_rate (float, optional): Requests per second above which the board answers
+                HTTP 429 (measured over the last second). None never rate limits.
+            recorded (bool): Serve the saved fixture pages (cycled) instead of rendering pages.
+            seed (int): Seed for latency, stalls and page content. The n-th request for a
+                URL gets the same latency and stall decision on every run, whatever order
+                requests arrive in.
+        """
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.timeout_rate = timeout_rate
+        self.stall = 10.0 if stall is None else stall
+        self.seed = seed
+        self.requests = 0
+        self.stalled = 0
+        self.rate_limited = 0
+        self.max_rate = max_rate
+        self._attempts = collections.Counter()
+        self._recent = collections.deque()
+        self._lock = threading.Lock()
+        self._recorded = None
+        if recorded:
+            self._recorded = {"search_page": fixtures.load_fixture_pages("search_page"),
+                              "detail_page": fixtures.load_fixture_pages("detail_page")}
+            if not all(self._recorded.values()):
+                raise FileNotFoundError(f"No fixture pages in {fixtures.FIXTURES_DIR}; run benchmarks/fixtures.py first.")
+        self._server = None
+        self._thread = None
+        self.base_url = None
+
+    @property
+    def search_url(self):
+        """Value for config.BASE_URL."""
+        return f"{self.base_url}/jobs"
+
+    def _over_rate(self):
+        if not self.max_rate:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and self._recent[0] < now - 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_rate:
+                self.rate_limited += 1
+                return True
+            self._recent.append(now)
+            return False
+
+    def _delay(self, path):
+        with self._lock:
+            self.requests += 1
+            self._attempts[path] += 1
+            rng = random.Random(f"{self.seed}:{path}:{self._attempts[path]}")
+            stalled = rng.random() < self.timeout_rate
+            self.stalled += stalled
+        delay = self.stall if stalled else self.latency + rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _absolute_links(self, html_content):
+        # Recorded pages link relative to the real site; keep job links on this server
+        return html_content.replace('href="/', f'href="{self.base_url}/')
+
+    def render_search_page(self, page_num):
+        if page_num >= self.pages:
+            return "<!DOCTYPE html><html><body><div id=\"resultsCol\"><p>No jobs found.</p></div></body></html>"
+        has_next = page_num < self.pages - 1
+        if self._recorded:
+            saved = self._recorded["search_page"]
+            return self._absolute_links(saved[page_num % len(saved)])
+        return fixtures.render_search_page(page_num, self.jobs_per_page, has_next=has_next,
+                                           base_url=self.base_url, seed=self.seed * 100003 + page_num)
+
+    def render_detail_page(self, key):
+        if self._recorded:
+            saved = self._recorded["detail_page"]
+            return saved[hash(key) % len(saved)]
+        return fixtures.render_detail_page(key, seed=key)
+
+    def start(self):
+        """Starts serving on a free local port."""
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.board = self
+        host, port = self._server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-job-board", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,40 +1,193 @@
+import argparse
 import logging
 import sys
 import os
+import time
+
+_IMPORT_START = time.perf_counter()
 
 # This allows running the script from the project root directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src import utils
 from src import config
+from src import metrics
+from src.batch import BatchScraper, load_batch_file
+from src.checkpoint import CheckpointJournal
+from src.dedup import JobDeduplicator
+from src.enrich import DetailEnricher
+from src.fetchers import BACKENDS
+from src.parse_pool import ParsePool
+from src.pipeline import run_pipeline
 from src.scraper import JobScraper
+from src.seen_jobs import SeenJobsIndex
+from src.sinks import FORMATS, log_output_report, open_sinks
+
+metrics.observe("import_seconds", time.perf_counter() - _IMPORT_START, module="main")
+
+def parse_args(argv=None):
+    """Parses the command line arguments."""
+    arg_parser = argparse.ArgumentParser(description="Advanced Job Scraper")
+    arg_parser.add_argument("--backend", choices=BACKENDS, default=config.FETCH_BACKEND,
+                            help="Page fetch backend: plain HTTP, Selenium, or HTTP with Selenium fallback (default: %(default)s)")
+    arg_parser.add_argument("--pipeline", action="store_true",
+                            help="Run fetching, parsing, detail enrichment and saving as overlapping asyncio stages")
+    arg_parser.add_argument("--details", action="store_true", default=config.ENRICH_DETAILS,
+                            help="Fetch each job's detail page (cached on disk) and add its full description")
+    arg_parser.add_argument("--incremental", action="store_true", default=config.INCREMENTAL,
+                            help="Only emit jobs not seen by previous runs and stop at the first page with nothing new")
+    arg_parser.add_argument("--dedup", action="store_true", default=config.DEDUP,
+                            help="Collapse exact and near-duplicate postings (persistent MinHash/LSH index)")
+    arg_parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=config.OUTPUT_FORMATS,
+                            help="Output formats, streamed page by page (default: %(default)s)")
+    arg_parser.add_argument("--metrics-port", type=int, default=config.METRICS_PORT, metavar="PORT",
+                            help="Serve Prometheus metrics on this port while the scraper runs")
+    arg_parser.add_argument("--batch", metavar="FILE",
+                            help="JSON file of query/location searches to scrape together into one merged, deduplicated output")
+    arg_parser.add_argument("--parse-processes", type=int, default=config.PARSE_PROCESSES, metavar="N",
+                            help="Parse pages in N worker processes instead of in-process (default: %(default)s)")
+    arg_parser.add_argument("--profile-startup", action="store_true",
+                            help="Measure start-up (imports, scraper setup, one WebDriver launch), log the breakdown and exit")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help="Continue an interrupted run from its checkpoint instead of starting over")
+    args = arg_parser.parse_args(argv)
+    if args.batch and args.pipeline:
+        arg_parser.error("--batch cannot be combined with --pipeline")
+    return args
+
+def profile_startup(backend):
+    """Runs the start-up steps of a scrape without scraping and logs where the time went.
+
+    Covers main.py's imports, scraper setup and, unless the backend is plain HTTP,
+    starting (and closing) one WebDriver session, including chromedriver resolution.
+
+    Args:
+        backend (str): The fetch backend the run would use.
+    """
+    start = time.perf_counter()
+    scraper_instance = JobScraper(backend=backend)
+    setup_seconds = time.perf_counter() - start
+    try:
+        if backend != "http":
+            scraper_instance._setup_driver().quit()
+    except Exception as e:
+        logging.error(f"WebDriver start failed: {e}")
+    finally:
+        scraper_instance.close_driver()
+
+    timers = metrics.REGISTRY.summary()["timers"]
+    steps = [(f"import {series.split('=', 1)[1]}", stats["total_s"])
+             for series, stats in timers.get("import_seconds", {}).items()]
+    steps.append(("scraper setup", setup_seconds))
+    steps += [(f"driver {series.split('=', 1)[1]}", stats["total_s"])
+              for series, stats in timers.get("driver_init_seconds", {}).items()]
+    logging.info(f"Start-up profile (backend {backend}): {sum(seconds for _, seconds in steps):.3f} s")
+    for step, seconds in steps:
+        logging.info(f"  {step:<40} {seconds * 1000:>9.1f} ms")
 
-def main():
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
     utils.setup_logging()
     logging.info("--- Advanced Job Scraper Initialized ---")
+    if args.profile_startup:
+        profile_startup(args.backend)
+        return
+
+    metrics_server = None
+    if args.metrics_port is not None:
+        metrics_server = metrics.start_http_server(args.metrics_port)
 
     scraper_instance = None # Initialize to ensure it exists in finally block
+    enricher = None
+    seen_index = None
+    deduplicator = None
+    journal = None
+    parse_pool = None
+    completed = False
+    output_sinks = []
     try:
-        scraper_instance = JobScraper()
-        scraped_data = scraper_instance.scrape_jobs()
-
-        if scraped_data:
-            logging.info(f"Saving {len(scraped_data)} job postings...")
-            # Save to both CSV and JSON as configured
-            utils.save_to_csv(scraped_data, config.OUTPUT_FILENAME_CSV)
-            utils.save_to_json(scraped_data, config.OUTPUT_FILENAME_JSON)
-            logging.info("Data saving complete.")
+        if args.incremental:
+            seen_index = SeenJobsIndex()
+            logging.info(f"Incremental mode: {len(seen_index)} jobs already seen.")
+        if args.dedup:
+            # Earlier copies only count when their output was delivered and kept (incremental runs)
+            deduplicator = JobDeduplicator(across_runs=args.incremental)
+        if config.CHECKPOINT or args.resume:
+            journal = CheckpointJournal(resume=args.resume)
+        if args.parse_processes > 0:
+            parse_pool = ParsePool(args.parse_processes)
+        scraper_instance = JobScraper(backend=args.backend, seen_index=seen_index, deduplicator=deduplicator,
+                                      checkpoint=journal, parse_pool=parse_pool)
+        if args.details:
+            enricher = DetailEnricher(scraper_instance)
+        # Each incremental run writes only its new/changed jobs to timestamped files
+        output_sinks = open_sinks(args.formats, include_details=args.details, timestamped=seen_index is not None)
+
+        def write_batch(page_jobs):
+            for sink in output_sinks:
+                sink.write(page_jobs)
+
+        # Jobs are written page by page as they are scraped, never collected in memory
+        if args.pipeline:
+            jobs_written = run_pipeline(scraper_instance, write_batch, enricher=enricher)
+        else:
+            if args.batch:
+                job_pages = BatchScraper(scraper_instance, load_batch_file(args.batch)).iter_job_pages()
+            else:
+                job_pages = scraper_instance.iter_job_pages()
+            jobs_written = 0
+            for page_jobs in job_pages:
+                if enricher:
+                    enricher.enrich(page_jobs)
+                write_batch(page_jobs)
+                jobs_written += len(page_jobs)
+
+        for sink in output_sinks:
+            sink.close()
+        if jobs_written:
+            logging.info(f"Data saving complete: {jobs_written} job postings.")
+            log_output_report(output_sinks)
         else:
             logging.warning("No data was scraped. Output files will not be created or will be empty.")
+        if scraper_instance.interrupted:
+            # Leave the indexes untouched so a resumed run emits the same jobs again, plus the rest
+            logging.warning("The run was interrupted before the last page. Run again with --resume to finish it.")
+        else:
+            if seen_index is not None:
+                seen_index.commit() # Only remember jobs once they have been saved
+            if deduplicator:
+                deduplicator.commit()
+            completed = True
 
     except Exception as e:
         logging.critical(f"An unhandled error occurred during the scraping process: {e}", exc_info=True)
         # Depending on the error (e.g., WebDriver setup failure), scraper_instance might be None
 
     finally:
+        for sink in output_sinks:
+            sink.abort() # No-op for sinks that were closed; keeps partial data in .part files otherwise
+        if enricher:
+            enricher.close()
+        if seen_index is not None:
+            seen_index.close()
+        if deduplicator:
+            deduplicator.close()
         if scraper_instance:
             scraper_instance.close_driver()
+        if parse_pool:
+            parse_pool.close()
+        if journal:
+            if completed:
+                journal.remove() # Outputs are saved, nothing left to resume
+            else:
+                journal.close()
+                logging.info(f"Checkpoint kept at {journal.path}. Run again with --resume to continue.")
+        metrics.log_stage_report()
+        if config.METRICS_SUMMARY_FILENAME:
+            metrics.write_summary(utils.get_output_path(config.METRICS_SUMMARY_FILENAME), argv=sys.argv[1:] if argv is None else list(argv))
+        if metrics_server:
+            metrics_server.shutdown()
         logging.info("--- Advanced Job Scraper Finished ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+# Multi-query / multi-location batch scheduling for the Advanced Job Scraper
+
+import itertools
+import json
+import logging
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from selenium.common.exceptions import WebDriverException
+
+from . import config
+from . import utils
+
+Search = namedtuple("Search", ["query", "location", "max_pages"])
+
+
+def load_batch_file(path):
+    """Loads the searches of a batch job file.
+
+    The file is JSON, either a list of searches or an object that combines
+    every query with every location (plus optional explicit searches):
+
+        [{"query": "Python Developer", "location": "Remote", "max_pages": 5}, ...]
+
+        {"queries": ["Python Developer", "Data Engineer"],
+         "locations": ["Remote", "New York, NY"],
+         "max_pages": 3,
+         "searches": [{"query": "Django", "location": "Berlin"}]}
+
+    `max_pages` is optional and defaults to config.MAX_PAGES.
+
+    Args:
+        path (str): Path of the batch job file.
+
+    Returns:
+        list: The `Search` tuples, without duplicates, in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    if isinstance(spec, list):
+        entries, default_pages = spec, config.MAX_PAGES
+    else:
+        default_pages = spec.get("max_pages", config.MAX_PAGES)
+        entries = [{"query": query, "location": location}
+                   for query, location in itertools.product(spec.get("queries", []), spec.get("locations", []))]
+        entries.extend(spec.get("searches", []))
+
+    searches = []
+    for entry in entries:
+        search = Search(entry["query"], entry.get("location", config.LOCATION), int(entry.get("max_pages", default_pages)))
+        if search not in searches:
+            searches.append(search)
+    if not searches:
+        raise ValueError(f"Batch file {path} does not define any searches.")
+    return searches
+
+
+class _SearchState:
+    """Scheduling state of one search in a batch."""
+
+    def __init__(self, search):
+        self.search = search
+        self.next_page = 0 # Next page to schedule
+        self.next_emit = 0 # Next page to hand out, pages are processed in order
+        self.stop_at = search.max_pages # First page past the end of the results
+        self.in_flight = 0
+        self.results = {} # Finished pages waiting for earlier ones
+
+
+class BatchScraper:
+    """Scrapes many (query, location) searches over one shared worker pool.
+
+    Work is scheduled as (query, location, page) units, taken round-robin from
+    every search that still has pages left, so all searches progress together
+    and share the scraper's fetch backend (HTTP connections and WebDriver
+    sessions) and per-host rate limiter. Throughput therefore scales with the
+    number of workers rather than the number of searches.
+    """
+
+    def __init__(self, scraper, searches):
+        """
+        Args:
+            scraper (JobScraper): Provides the fetch backend, rate limiting and filters.
+            searches (list): `Search` tuples, e.g. from `load_batch_file`.
+        """
+        self.scraper = scraper
+        self.searches = list(searches)
+        self._emitted_ids = set() # Exact dedup across searches when no JobDeduplicator is configured
+        self._rotation = 0
+
+    def _can_schedule(self, state):
+        if state.next_page >= state.stop_at:
+            return False
+        if self.scraper.seen_index is not None:
+            # Incremental runs usually stop after the first page; ramp up like JobScraper._iter_pages
+            return state.next_page - state.next_emit < (1 << state.next_emit)
+        return True
+
+    def _schedule(self, executor, states, pending):
+        """Fills the worker pool with pages taken round-robin from the active searches."""
+        while len(pending) < self.scraper.max_workers:
+            for offset in range(len(states)):
+                state = states[(self._rotation + offset) % len(states)]
+                if self._can_schedule(state):
+                    break
+            else:
+                return # Nothing left to schedule right now
+            self._rotation = (self._rotation + offset + 1) % len(states)
+            search = state.search
+            future = executor.submit(self.scraper._scrape_page, state.next_page, search.query, search.location)
+            pending[future] = (state, state.next_page)
+            state.next_page += 1
+            state.in_flight += 1
+
+    def _merge(self, page_jobs):
+        """Drops jobs already emitted by another search (when no deduplicator handles it)."""
+        if self.scraper.deduplicator is not None:
+            return page_jobs
+        unique_jobs = []
+        for job in page_jobs:
+            job_id = utils.normalize_job_id(job["url"])
+            if job_id not in self._emitted_ids:
+                self._emitted_ids.add(job_id)
+                unique_jobs.append(job)
+        return unique_jobs
+
+    def _drain(self, state):
+        """Processes a search's finished pages in page order, yielding their jobs."""
+        search = state.search
+        while state.next_emit in state.results and state.next_emit < state.stop_at:
+            page_num = state.next_emit
+            page_jobs = state.results.pop(page_num)
+            state.next_emit += 1
+            if page_jobs is None:
+                continue # Page was skipped, move on to the next one
+            if not page_jobs:
+                logging.info(f"[{search.query} / {search.location}] No jobs on page {page_num + 1}. Search finished.")
+                state.stop_at = page_num
+                break
+            page_jobs = self.scraper.filter_page_jobs(page_num, page_jobs)
+            if page_jobs is None:
+                state.stop_at = page_num + 1
+                break
+            page_jobs = self._merge(page_jobs)
+            logging.info(f"[{search.query} / {search.location}] {len(page_jobs)} jobs from page {page_num + 1}.")
+            if page_jobs:
+                yield page_jobs
+        if state.next_emit >= state.stop_at:
+            state.results.clear()
+
+    def iter_job_pages(self):
+        """Runs every search and yields batches of merged, deduplicated jobs as they are ready.
+
+        Yields:
+            list: The new jobs of one results page of one search.
+        """
+        logging.info(f"Starting batch scraping of {len(self.searches)} searches "
+                     f"({self.scraper.max_workers} worker(s), {self.scraper.backend} backend)")
+        states = [_SearchState(search) for search in self.searches]
+        pending = {}
+        total_jobs = 0
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as executor:
+            try:
+                self._schedule(executor, states, pending)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        state, page_num = pending.pop(future)
+                        state.in_flight -= 1
+                        try:
+                            state.results[page_num] = future.result()
+                        except WebDriverException as e:
+                            logging.error(f"WebDriver error on page {page_num + 1} of {state.search}: {e}")
+                            self.scraper.interrupted = True
+                            state.stop_at = min(state.stop_at, page_num)
+                        for page_jobs in self._drain(state):
+                            total_jobs += len(page_jobs)
+                            yield page_jobs
+                    # Drop pages scheduled past the end of a finished search
+                    for future, (state, page_num) in list(pending.items()):
+                        if page_num >= state.stop_at and future.cancel():
+                            del pending[future]
+                    self._schedule(executor, states, pending)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        logging.info(f"Batch scraping finished. Total jobs collected: {total_jobs}")
+        logging.info(f"Pages served per backend: {self.scraper.fetcher.get_stats()}")
@@ -0,0 +1,121 @@
+# Crash-safe checkpoint journal for long scraping runs
+#
+# Every finished (query, location, page) unit is appended to a journal file
+# together with the jobs parsed from it, as soon as the page is parsed. Each
+# record is framed as
+#
+#     <payload length: uint32 LE> <CRC-32 of payload: uint32 LE> <JSON payload>
+#
+# so a record torn by a crash (power loss, OOM kill) is detected on load and
+# cut off; everything before it is intact. A resumed run (main.py --resume)
+# replays the journaled pages instead of fetching them again and continues
+# with the first unfinished page, so a crash costs at most the pages that
+# were in flight. The journal is removed once a run has completed and its
+# outputs are saved.
+
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+
+from . import config
+from . import utils
+from .records import JobPosting
+
+MAGIC = b"JOBSCRAPER-JOURNAL\x00\x01"
+_FRAME = struct.Struct("<II")
+
+
+class CheckpointJournal:
+    """Append-only journal of the pages a run has finished."""
+
+    def __init__(self, path=None, resume=False, fsync=None):
+        """
+        Args:
+            path (str, optional): Journal file. Defaults to config.CHECKPOINT_FILENAME in the output directory.
+            resume (bool): Load the pages recorded by an unfinished run. Otherwise any
+                existing journal is discarded and a new one is started.
+            fsync (bool, optional): fsync after every record (survives power loss, not
+                just process crashes). Defaults to config.CHECKPOINT_FSYNC.
+        """
+        self.path = path or utils.get_output_path(config.CHECKPOINT_FILENAME)
+        self.fsync = config.CHECKPOINT_FSYNC if fsync is None else fsync
+        self._pages = {} # (query, location, page_num) -> jobs, for pages loaded on resume only
+        self._done = set() # Keys of every finished page, loaded or recorded by this run
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(self.path):
+            good_length = self._load()
+            self._file = open(self.path, "r+b")
+            self._file.truncate(good_length) # Drop a torn record left by the crash
+            self._file.seek(good_length)
+            logging.info(f"Resuming from checkpoint {self.path}: {len(self._done)} pages already done.")
+        else:
+            if os.path.exists(self.path):
+                logging.warning(f"Discarding the checkpoint of an unfinished run ({self.path}). Use --resume to continue it.")
+            self._file = open(self.path, "wb")
+            self._file.write(MAGIC)
+            self._sync()
+
+    def __len__(self):
+        return len(self._done)
+
+    def _load(self):
+        """Reads every intact record and returns the length of the valid prefix of the file."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a checkpoint journal.")
+        offset = len(MAGIC)
+        while offset + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, offset)
+            payload = data[offset + _FRAME.size:offset + _FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                logging.warning(f"Checkpoint journal is truncated or corrupt at byte {offset}; "
+                                f"ignoring the rest ({len(data) - offset} bytes).")
+                break
+            record = json.loads(payload)
+            key = (record["query"], record["location"], record["page"])
+            self._pages[key] = [JobPosting(**job) for job in record["jobs"]]
+            self._done.add(key)
+            offset += _FRAME.size + length
+        return offset
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def get_page(self, query, location, page_num):
+        """Returns the jobs journaled for a page by the resumed run, or None if it has to be scraped."""
+        with self._lock:
+            return self._pages.get((query, location, page_num))
+
+    def record_page(self, query, location, page_num, jobs):
+        """Appends a finished page and its parsed jobs (an empty list marks the end of the results).
+
+        Only the page's key is kept in memory; the jobs themselves are already held
+        (and enriched) by the scraper's results.
+        """
+        payload = json.dumps({"query": query, "location": location, "page": page_num, "jobs": jobs},
+                             ensure_ascii=False, default=dict).encode("utf-8") # default: JobPosting records
+        with self._lock:
+            self._file.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._sync()
+            self._done.add((query, location, page_num))
+
+    def close(self):
+        """Closes the journal, keeping it on disk for a later --resume."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def remove(self):
+        """Closes and deletes the journal once the run's outputs are safely saved."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -11,20 +11,132 @@ MAX_PAGES = 3
 OUTPUT_DIR = "../data"
 OUTPUT_FILENAME_CSV = "job_postings.csv"
 OUTPUT_FILENAME_JSON = "job_postings.json"
+OUTPUT_FILENAME_JSONL = "job_postings.jsonl"
+OUTPUT_FILENAME_JSONL_ZST = "job_postings.jsonl.zst"
+OUTPUT_FILENAME_PARQUET = "job_postings.parquet"
+OUTPUT_FILENAME_ARROW = "job_postings.arrow"
+# Formats written by main.py, streamed page by page:
+# "csv", "json", "jsonl", "jsonl.zst" (needs zstandard), "parquet" and "arrow" (need pyarrow)
+OUTPUT_FORMATS = ["csv", "json"]
+# Compression level for zstd-compressed JSON Lines (1-22, higher is smaller but slower)
+ZSTD_LEVEL = 3
+# When output files are fsynced: "never", "close" (once, before the atomic rename) or "batch" (after every page)
+FSYNC_POLICY = "close"
 
 # Logging configuration
 LOG_DIR = "../logs"
 LOG_FILENAME = "scraper.log"
 LOG_LEVEL = "INFO" # Options: DEBUG, INFO, WARNING, ERROR, CRITICAL
 
+# Page fetch backend: "http" (pooled keep-alive requests session), "selenium" (headless Chrome)
+# or "auto" (HTTP first, escalating to Selenium when a page has no job cards or is a JS challenge)
+FETCH_BACKEND = "auto"
+# User agent sent by both the HTTP session and Chrome
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
 # Selenium/WebDriver settings
 # Path to your WebDriver executable (if not using webdriver-manager)
 # WEBDRIVER_PATH = "/path/to/chromedriver"
 # Set to True to run the browser in headless mode (without GUI)
 HEADLESS_BROWSE = True
+# chromedriver path resolved by webdriver-manager, cached (in OUTPUT_DIR) with the Chrome version it
+# matches so no network version lookup happens at start-up until Chrome changes; None disables the cache
+CHROMEDRIVER_CACHE_FILENAME = "chromedriver_cache.json"
 # Timeouts (in seconds)
 PAGE_LOAD_TIMEOUT = 30
 ELEMENT_WAIT_TIMEOUT = 10
+# Fast browser mode: "eager" page loads (no waiting for images/subresources), images, media and
+# fonts blocked, and only the page's main content element read once a ready selector appears
+FAST_BROWSER = True
+# CSS selectors of the page's content container, whose outerHTML is returned. The wait ends as soon as the
+# first one appears; the others are page-shell fallbacks, only used once the page has fully loaded (or the
+# wait timed out). Each must name a single container of the whole content, never a repeated element such as a job card
+SEARCH_READY_SELECTORS = ["#mosaic-provider-jobcards", "#resultsCol", "#jobsearch-Main"]
+DETAIL_READY_SELECTORS = ["#jobDescriptionText", ".jobsearch-jobDescriptionText", ".jobsearch-ViewJobLayout"]
+# URL patterns Chrome does not download in fast browser mode (CDP Network.setBlockedURLs)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", # Images
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.wav", # Media
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", # Fonts
+]
+
+# Concurrency
+# Number of concurrent page workers / pooled sessions (1 = scrape pages sequentially)
+MAX_WORKERS = 3
+# Politeness limit: page requests per second sent to a single host (the starting rate when adaptive)
+HOST_RATE_LIMIT = 0.5
+# Adaptive rate control (AIMD): each host's rate grows while responses are fast and healthy and is
+# cut on timeouts, HTTP 429/503 and CAPTCHA pages. False keeps every host at its fixed limit.
+ADAPTIVE_RATE_LIMIT = True
+# Bounds of the adaptive per-host rate (requests per second)
+MAX_HOST_RATE = 2.0
+MIN_HOST_RATE = 0.05
+# Requests/sec added per second of healthy responses, and the multiplier applied when a host pushes back
+RATE_INCREASE = 0.05
+RATE_DECREASE_FACTOR = 0.5
+# Responses slower than this (seconds, moving average) stop the rate from growing
+LATENCY_TARGET = 5.0
+# Requests that may be sent back to back to an idle host
+RATE_LIMIT_BURST = 1
+
+# Retries of failed page loads (timeouts, connection errors, HTTP 429/5xx, CAPTCHA pages)
+MAX_RETRIES = 3
+# Jittered exponential backoff: retry n waits up to min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (n - 1)) seconds
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 30.0
+
+# Incremental scraping (python main.py --incremental)
+# Set to True to only emit new or changed jobs and stop paginating at the first page with nothing new
+INCREMENTAL = False
+# Index of jobs seen by previous runs (stored in OUTPUT_DIR)
+SEEN_INDEX_FILENAME = "seen_jobs.sqlite3"
+
+# Duplicate detection (python main.py --dedup)
+# Set to True to collapse duplicate postings (same job key, or near-identical title/company/summary)
+DEDUP = False
+# Persistent MinHash/LSH index of emitted postings (stored in OUTPUT_DIR)
+DEDUP_INDEX_FILENAME = "dedup_index.sqlite3"
+# Estimated Jaccard similarity of title+company+summary shingles at which two postings are duplicates
+DEDUP_THRESHOLD = 0.8
+# MinHash signature length and number of LSH bands (must divide the signature length)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Checkpointing (python main.py --resume)
+# Set to True to journal every parsed page so an interrupted run can be resumed with --resume
+CHECKPOINT = True
+# Journal of the pages finished by the current run (stored in OUTPUT_DIR, removed when the run completes)
+CHECKPOINT_FILENAME = "checkpoint.journal"
+# Set to True to fsync after every journaled page (survives power loss, not just crashes, at some speed cost)
+CHECKPOINT_FSYNC = True
+
+# Asyncio pipeline (python main.py --pipeline)
+# Capacity of each queue between pipeline stages; a full queue pauses the stages feeding it
+PIPELINE_QUEUE_SIZE = 4
+# Threads used for HTML parsing
+PARSE_WORKERS = 1
+
+# Process-pool parsing (python main.py --parse-processes N)
+# Worker processes that parse search and detail pages, so parsing scales across cores and doesn't
+# hold the GIL against the fetch threads; 0 parses in-process
+PARSE_PROCESSES = 0
+# Set to True to hand pages to the parse processes through shared memory instead of pickling them
+PARSE_SHARED_MEMORY = False
+
+# Job detail enrichment (python main.py --details)
+# Set to True to always fetch each job's detail page and add its full description
+ENRICH_DETAILS = False
+# Concurrent job detail page fetches
+DETAIL_WORKERS = 4
+# Politeness limit for detail pages: maximum requests per second per host
+DETAIL_RATE_LIMIT = 1.0
+# Parsed details are cached on disk (in OUTPUT_DIR) by job ID + listing content hash
+DETAIL_CACHE_FILENAME = "detail_cache.sqlite3"
+# Seconds before a cached detail page is fetched again
+DETAIL_CACHE_TTL = 7 * 24 * 3600
 
-# Delay between requests (in seconds) to avoid overwhelming the server
-REQUEST_DELAY = 2
+# Run metrics (timers and counters per stage, see src/metrics.py)
+# Port of the Prometheus text endpoint served during the run (python main.py --metrics-port 9100); None disables it
+METRICS_PORT = None
+# JSON summary of each run's metrics (stored in OUTPUT_DIR); None disables it
+METRICS_SUMMARY_FILENAME = "run_metrics.json"
@@ -0,0 +1,170 @@
+# Duplicate and near-duplicate job detection for the Advanced Job Scraper
+#
+# The same posting shows up on several result pages and under several
+# query/location searches, behind different tracking URLs. Records are
+# collapsed in two steps:
+#   1. exact: the normalized job ID from the URL (see utils.normalize_job_id)
+#      was already emitted during this run;
+#   2. near-duplicate: a MinHash signature over title + company + summary is
+#      looked up in an LSH band index, and candidates whose estimated Jaccard
+#      similarity reaches the threshold collapse the record. Lookups touch only
+#      the matching buckets, so the cost per record does not grow with the index.
+# The index is stored in SQLite and persists across runs. A normal run rewrites
+# its outputs from scratch, so it only collapses records into postings it has
+# emitted itself; an incremental run (whose earlier outputs were delivered and
+# are kept) also collapses a posting re-published under a new job key into the
+# copy a previous run emitted.
+
+import hashlib
+import logging
+import random
+import re
+import sqlite3
+import struct
+import threading
+
+from . import config
+from . import utils
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _shingles(job, size=3):
+    """Returns the word `size`-grams of a job's title, company and summary."""
+    text = " ".join(str(job.get(key, "")) for key in ("title", "company", "summary") if job.get(key) != "N/A")
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """Computes MinHash signatures with `num_perm` universal hash functions."""
+
+    def __init__(self, num_perm, seed=1):
+        rng = random.Random(seed) # Fixed seed: signatures must be comparable across runs
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingles):
+        """Returns the signature (tuple of ints) of a set of shingles."""
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+                  for s in shingles]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._params)
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimates the Jaccard similarity of two MinHash signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class JobDeduplicator:
+    """Collapses exact and near-duplicate job records against a persistent LSH index."""
+
+    def __init__(self, path=None, threshold=None, num_perm=None, bands=None, across_runs=False):
+        """
+        Args:
+            path (str, optional): SQLite file. Defaults to config.DEDUP_INDEX_FILENAME in the output directory.
+            threshold (float, optional): Estimated Jaccard similarity at which two records are
+                duplicates. Defaults to config.DEDUP_THRESHOLD.
+            num_perm (int, optional): MinHash permutations. Defaults to config.MINHASH_PERMUTATIONS.
+            bands (int, optional): LSH bands; must divide `num_perm`. Defaults to config.LSH_BANDS.
+            across_runs (bool): Also collapse near-duplicates of postings emitted by earlier runs.
+                Only correct when those runs' outputs are kept (incremental mode).
+        """
+        self.path = path or utils.get_output_path(config.DEDUP_INDEX_FILENAME)
+        self.threshold = threshold or config.DEDUP_THRESHOLD
+        num_perm = num_perm or config.MINHASH_PERMUTATIONS
+        self.bands = bands or config.LSH_BANDS
+        if num_perm % self.bands:
+            raise ValueError(f"LSH bands ({self.bands}) must divide the number of permutations ({num_perm}).")
+        self.rows = num_perm // self.bands
+        self.across_runs = across_runs
+        self.hasher = MinHasher(num_perm)
+        self.stats = {"kept": 0, "exact": 0, "near": 0}
+        self._emitted = set() # Job IDs emitted during this run
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS postings (job_id TEXT PRIMARY KEY, signature BLOB NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS lsh_buckets (band INTEGER NOT NULL, bucket INTEGER NOT NULL, job_id TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets (band, bucket);"
+        )
+        self._conn.commit()
+
+    def _band_buckets(self, signature):
+        """Yields (band, bucket) pairs for a signature."""
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f"<{self.rows}I", *rows), digest_size=8).digest()
+            yield band, struct.unpack("<q", digest)[0]
+
+    def _find_near_duplicate(self, job_id, signature, buckets):
+        """Returns the ID of an indexed posting similar to `signature`, or None."""
+        candidates = set()
+        for band, bucket in buckets:
+            candidates.update(row[0] for row in self._conn.execute(
+                "SELECT job_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates.discard(job_id)
+        if not self.across_runs:
+            candidates &= self._emitted # Copies from earlier runs are not in this run's output
+        for candidate in candidates:
+            row = self._conn.execute("SELECT signature FROM postings WHERE job_id = ?", (candidate,)).fetchone()
+            other = struct.unpack(f"<{len(signature)}I", row[0])
+            if estimate_similarity(signature, other) >= self.threshold:
+                return candidate
+        return None
+
+    def is_duplicate(self, job):
+        """Checks a job against the index and records it if it is not a duplicate.
+
+        Returns:
+            bool: True if the job duplicates one emitted during this run (or, with
+                `across_runs`, one indexed by an earlier run).
+        """
+        job_id = utils.normalize_job_id(job["url"])
+        with self._lock:
+            if job_id in self._emitted:
+                self.stats["exact"] += 1
+                return True
+            known = self._conn.execute("SELECT 1 FROM postings WHERE job_id = ?", (job_id,)).fetchone()
+            if not known:
+                signature = self.hasher.signature(_shingles(job))
+                buckets = list(self._band_buckets(signature))
+                duplicate_of = self._find_near_duplicate(job_id, signature, buckets)
+                if duplicate_of:
+                    logging.debug(f"Collapsed near-duplicate {job_id} into {duplicate_of}")
+                    self.stats["near"] += 1
+                    return True
+                self._conn.execute("INSERT INTO postings (job_id, signature) VALUES (?, ?)",
+                                   (job_id, struct.pack(f"<{len(signature)}I", *signature)))
+                self._conn.executemany("INSERT INTO lsh_buckets (band, bucket, job_id) VALUES (?, ?, ?)",
+                                       [(band, bucket, job_id) for band, bucket in buckets])
+            self._emitted.add(job_id)
+            self.stats["kept"] += 1
+            return False
+
+    def filter(self, jobs):
+        """Returns the jobs that are not duplicates, in their original order."""
+        return [job for job in jobs if not self.is_duplicate(job)]
+
+    @property
+    def collapsed(self):
+        """Number of records collapsed so far (exact + near duplicates)."""
+        return self.stats["exact"] + self.stats["near"]
+
+    def commit(self):
+        """Persists the postings indexed during this run."""
+        with self._lock:
+            self._conn.commit()
+        logging.info(f"Deduplication: {self.stats['kept']} records kept, {self.collapsed} collapsed "
+                     f"({self.stats['exact']} exact, {self.stats['near']} near-duplicates).")
+
+    def close(self):
+        """Closes the index, discarding uncommitted postings."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,96 @@
+# Cached chromedriver resolution for the Advanced Job Scraper
+#
+# webdriver-manager's ChromeDriverManager().install() looks up the matching
+# driver version over the network on every call, which dominates the start-up
+# of short runs. The resolved driver path is stored in a small JSON file
+# together with the installed Chrome version it was resolved for (read from
+# the local Chrome binary, no network). Later runs reuse the path while Chrome
+# is unchanged and the driver file still exists, and resolve again otherwise.
+
+import json
+import logging
+import os
+import threading
+import time
+
+from . import config
+from . import metrics
+from . import utils
+
+_lock = threading.Lock()
+_resolved_path = None # Resolved once per process, shared by every pooled driver
+
+
+def _cache_path():
+    return utils.get_output_path(config.CHROMEDRIVER_CACHE_FILENAME) if config.CHROMEDRIVER_CACHE_FILENAME else None
+
+
+def installed_chrome_version():
+    """Returns the version of the locally installed Chrome (or Chromium), or None if it can't be found."""
+    os_manager = utils.lazy_import("webdriver_manager.core.os_manager")
+    manager = os_manager.OperationSystemManager()
+    for chrome_type in (os_manager.ChromeType.GOOGLE, os_manager.ChromeType.CHROMIUM):
+        try:
+            version = manager.get_browser_version_from_os(chrome_type)
+        except Exception as e:
+            logging.debug(f"Could not read the {chrome_type} version: {e}")
+            continue
+        if version:
+            return version
+    return None
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable chromedriver cache {path}: {e}")
+        return None
+
+
+def resolve_chromedriver():
+    """Returns the chromedriver path, from the cache when it is still valid for the installed Chrome.
+
+    Returns:
+        str: Path of the chromedriver executable.
+    """
+    global _resolved_path
+    with _lock:
+        if _resolved_path:
+            return _resolved_path
+        with metrics.timer("driver_init_seconds", step="resolve"):
+            cache_path = _cache_path()
+            chrome_version = installed_chrome_version()
+            cached = _load(cache_path) if cache_path else None
+            if (cached and cached.get("chrome_version") == chrome_version
+                    and os.path.exists(cached.get("driver_path", ""))):
+                logging.info(f"Using cached chromedriver {cached['driver_path']} (Chrome {chrome_version}).")
+                _resolved_path = cached["driver_path"]
+                return _resolved_path
+
+            # Use webdriver-manager to automatically handle driver download/update
+            chrome = utils.lazy_import("webdriver_manager.chrome")
+            driver_path = chrome.ChromeDriverManager().install()
+            if cache_path:
+                try:
+                    with open(cache_path, "w", encoding="utf-8") as f:
+                        json.dump({"chrome_version": chrome_version, "driver_path": driver_path,
+                                   "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=4)
+                except OSError as e:
+                    logging.warning(f"Could not save the chromedriver cache {cache_path}: {e}")
+            logging.info(f"Resolved chromedriver {driver_path} (Chrome {chrome_version}).")
+            _resolved_path = driver_path
+            return _resolved_path
+
+
+def invalidate():
+    """Forgets the resolved path (e.g. after the driver failed to start), so the next run resolves it again."""
+    global _resolved_path
+    with _lock:
+        _resolved_path = None
+        cache_path = _cache_path()
+        if cache_path and os.path.exists(cache_path):
+            os.remove(cache_path)
@@ -0,0 +1,158 @@
+# Job detail page enrichment for the Advanced Job Scraper
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import config
+from . import utils
+
+
+class DetailCache:
+    """Persistent on-disk cache of parsed job details.
+
+    Entries are keyed by the normalized job ID and the hash of the listing
+    content, so a posting whose title/company/location/summary changed is
+    fetched again. Entries older than the TTL are ignored.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        """
+        Args:
+            path (str, optional): SQLite file. Defaults to config.DETAIL_CACHE_FILENAME in the output directory.
+            ttl (float, optional): Seconds an entry stays valid. Defaults to config.DETAIL_CACHE_TTL.
+        """
+        self.path = path or utils.get_output_path(config.DETAIL_CACHE_FILENAME)
+        self.ttl = config.DETAIL_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_details ("
+            " job_id TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " details TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, job_id, content_hash):
+        """Returns the cached details dict, or None if missing, changed or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT details FROM job_details WHERE job_id = ? AND content_hash = ? AND fetched_at >= ?",
+                (job_id, content_hash, time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, job_id, content_hash, details):
+        """Stores the parsed details of a job."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_details (job_id, content_hash, details, fetched_at) VALUES (?, ?, ?, ?)",
+                (job_id, content_hash, json.dumps(details, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Deletes expired entries. Returns the number of rows removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM job_details WHERE fetched_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DetailEnricher:
+    """Fetches job detail pages concurrently and merges `parse_job_details` into each job."""
+
+    def __init__(self, scraper, cache=None, max_workers=None):
+        """
+        Args:
+            scraper (JobScraper): Provides the fetch backend and detail rate limiter.
+            cache (DetailCache, optional): Details cache. Defaults to a DetailCache at the configured path.
+            max_workers (int, optional): Concurrent detail fetches. Defaults to config.DETAIL_WORKERS.
+        """
+        self.scraper = scraper
+        if cache is None:
+            cache = DetailCache()
+            purged = cache.purge_expired() # Postings that disappeared would otherwise stay forever
+            if purged:
+                logging.info(f"Removed {purged} expired entries from the job details cache.")
+        self.cache = cache
+        self.max_workers = max(1, max_workers or config.DETAIL_WORKERS)
+        self.stats = {"cached": 0, "fetched": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def get_stats(self):
+        """Returns a copy of the counters for the whole run."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    @staticmethod
+    def _format_stats(stats):
+        return f"{stats['fetched']} fetched, {stats['cached']} from cache, {stats['failed']} failed"
+
+    def enrich_job(self, job):
+        """Adds the detail page fields to a single job, using the cache when possible.
+
+        Args:
+            job (dict): A job record from `parser.parse_job_listings`. Updated in place.
+
+        Returns:
+            dict: The same job record.
+        """
+        job_id = utils.normalize_job_id(job["url"])
+        content_hash = utils.job_content_hash(job)
+        details = self.cache.get(job_id, content_hash)
+        if details is not None:
+            self._count("cached")
+            job.update(details)
+            return job
+
+        try:
+            details = self.scraper.scrape_job_details(job["url"])
+        except Exception as e:
+            logging.warning(f"Could not fetch job details for {job['url']}: {e}")
+            self._count("failed")
+            return job
+
+        if details.get("full_description", "N/A") != "N/A":
+            self.cache.put(job_id, content_hash, details) # Don't cache pages that failed to parse
+        self._count("fetched")
+        job.update(details)
+        return job
+
+    def enrich(self, jobs):
+        """Enriches a list of jobs concurrently.
+
+        Args:
+            jobs (list): Job records from `parser.parse_job_listings`. Updated in place.
+
+        Returns:
+            list: The same job records.
+        """
+        if not jobs:
+            return jobs
+        logging.info(f"Fetching job details for {len(jobs)} jobs with {self.max_workers} worker(s)...")
+        before = self.get_stats()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="detail") as executor:
+            list(executor.map(self.enrich_job, jobs))
+        after = self.get_stats()
+        logging.info(f"Job details: {self._format_stats({key: after[key] - before[key] for key in after})}.")
+        return jobs
+
+    def close(self):
+        """Logs the run's detail totals and closes the cache."""
+        if any(self.stats.values()):
+            logging.info(f"Job details for the run: {self._format_stats(self.get_stats())}.")
+        self.cache.close()
@@ -0,0 +1,385 @@
+# Page fetch backends for the Advanced Job Scraper
+
+import logging
+import queue
+import re
+import threading
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from . import config
+from . import metrics
+from . import parser
+
+# Markers of bot-protection / JavaScript challenge pages that plain HTTP cannot get past
+CHALLENGE_RE = re.compile(
+    r"captcha|cf-challenge|challenge-platform|cf_chl_|just a moment\.\.\.|enable javascript",
+    re.IGNORECASE,
+)
+
+
+# HTTP statuses worth retrying, and those that also mean "slow down"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_STATUSES = frozenset({429, 503})
+
+
+class BlockedPageError(Exception):
+    """Raised when a page is still a CAPTCHA or JavaScript challenge after every retry."""
+
+
+class BrowserUnavailableError(WebDriverException):
+    """Raised when a WebDriver session cannot be started (no Chrome, chromedriver unreachable)."""
+
+
+def retry_after_seconds(response):
+    """Returns the delay requested by a response's Retry-After header (in seconds), or 0."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except (AttributeError, ValueError):
+        return 0.0 # Missing response, or an HTTP date we don't bother parsing
+
+
+def looks_like_challenge(html_content):
+    """Returns True if the HTML looks like a CAPTCHA or JavaScript challenge page."""
+    return bool(CHALLENGE_RE.search(html_content[:20000])) # Challenges announce themselves early
+
+
+def has_job_listings(html_content):
+    """Default completeness check for search pages: at least one job parsed."""
+    return bool(parser.parse_job_listings(html_content))
+
+
+def has_description(details):
+    """Returns True if details from `parser.parse_job_details` include the job description."""
+    return details.get("full_description", "N/A") != "N/A"
+
+
+def has_job_details(html_content):
+    """Completeness check for job detail pages: the description container is present."""
+    return has_description(parser.parse_job_details(html_content))
+
+
+class ParsedPageCheck:
+    """Completeness check that keeps what it parsed, so a checked page is not parsed again.
+
+    Backends that escalate (AutoFetcher) parse every HTTP response to decide
+    whether it is complete. Use one instance per fetch and read the parsed
+    result back with `result_for` instead of parsing the returned HTML again.
+    """
+
+    def __init__(self, parse, is_complete=bool):
+        """
+        Args:
+            parse (callable): Parses a page's HTML, e.g. `scraper.parser.parse_job_listings`
+                (so the check runs on the parse pool when there is one).
+            is_complete (callable): Tells from the parsed result whether the page has the
+                expected content. Defaults to "not empty".
+        """
+        self.parse = parse
+        self.is_complete = is_complete
+        self._html_content = None
+        self._result = None
+
+    def __call__(self, html_content):
+        self._result = self.parse(html_content)
+        self._html_content = html_content
+        return self.is_complete(self._result)
+
+    def result_for(self, html_content):
+        """Returns the parsed `html_content`, parsing it only if this check has not seen it
+        (e.g. the page came from a browser after an escalation)."""
+        if html_content is self._html_content:
+            return self._result
+        return self.parse(html_content)
+
+
+class Fetcher:
+    """Base class for page fetch backends.
+
+    Subclasses implement `fetch(url)` returning the page HTML and may
+    override `close()` to release resources. Every fetcher keeps per-run
+    counters in `stats`.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def get_stats(self):
+        """Returns a copy of the per-run counters."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def fetch(self, url, is_complete=None, ready_selectors=None):
+        """Fetches a page and returns its HTML.
+
+        Args:
+            url (str): The URL to load.
+            is_complete (callable, optional): Predicate telling whether the HTML has
+                the expected content. Only used by backends that can escalate.
+            ready_selectors (list, optional): CSS selectors of the page's main content.
+                Browser backends in fast mode wait for the first one to appear and
+                return only its outerHTML.
+
+        Returns:
+            str: The HTML content of the page (or of its main content element).
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Releases any resources held by the fetcher."""
+
+
+class HttpFetcher(Fetcher):
+    """Fetches pages with a pooled, keep-alive `requests` session.
+
+    `pool_size` is the number of page workers; room for config.DETAIL_WORKERS
+    detail fetches is added on top.
+    """
+
+    name = "http"
+
+    def __init__(self, pool_size=None):
+        super().__init__()
+        # Page workers and detail workers share the session's connections
+        pool_size = (pool_size or config.MAX_WORKERS) + config.DETAIL_WORKERS
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": config.USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+
+    def fetch(self, url, is_complete=None, ready_selectors=None):
+        try:
+            with metrics.timer("http_fetch_seconds"):
+                response = self.session.get(url, timeout=config.PAGE_LOAD_TIMEOUT)
+        except requests.Timeout:
+            metrics.inc("fetch_timeouts_total", backend=self.name)
+            raise
+        response.raise_for_status()
+        self._count(self.name)
+        metrics.inc("pages_fetched_total", backend=self.name)
+        metrics.inc("fetched_bytes_total", len(response.content), backend=self.name)
+        return response.text
+
+    def close(self):
+        self.session.close()
+        logging.info("HTTP session closed.")
+
+
+class SeleniumFetcher(Fetcher):
+    """Fetches pages on a lazily grown pool of Selenium WebDriver sessions.
+
+    In fast mode (config.FAST_BROWSER) pages are loaded with the "eager" page
+    load strategy, so `driver.get` returns once the DOM is ready; the fetcher
+    then waits only until the page's content selector appears (or the page
+    finishes loading without it, and a fallback container is used) and reads
+    that element's outerHTML instead of serializing the whole document.
+    """
+
+    name = "selenium"
+
+    def __init__(self, driver_factory, max_drivers=None, fast=None):
+        """
+        Args:
+            driver_factory (callable): Returns a new, configured WebDriver.
+            max_drivers (int, optional): Pool size. Defaults to config.MAX_WORKERS.
+            fast (bool, optional): Wait for ready selectors and read only the content element.
+                Defaults to config.FAST_BROWSER.
+        """
+        super().__init__()
+        self.driver_factory = driver_factory
+        self.max_drivers = max(1, max_drivers or config.MAX_WORKERS)
+        self.fast = config.FAST_BROWSER if fast is None else fast
+        self._drivers = []
+        self._idle_drivers = queue.Queue()
+        self._pool_lock = threading.Lock()
+
+    def _borrow_driver(self):
+        """Takes an idle WebDriver from the pool, starting a new one if the pool is not full."""
+        try:
+            return self._idle_drivers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if len(self._drivers) < self.max_drivers:
+                try:
+                    driver = self.driver_factory()
+                except Exception as e:
+                    # Not a page error: retrying the page would only launch the browser again
+                    raise BrowserUnavailableError(f"Could not start a WebDriver: {e}") from e
+                self._drivers.append(driver)
+                return driver
+        return self._idle_drivers.get() # Pool is full, wait for a worker to finish
+
+    @staticmethod
+    def _wait_ready(driver, ready_selectors):
+        """Waits until the page's content has rendered, or the page has fully loaded.
+
+        The first selector names the content itself (e.g. the job cards'
+        container) and ends the wait as soon as it appears. The others are
+        fallback containers that are part of the page shell, present before the
+        content renders, so they are only used once document.readyState is
+        "complete" or the wait has timed out. A selector matching several
+        elements names repeated items (e.g. job cards) rather than a container,
+        so the page is read whole.
+
+        Returns:
+            WebElement or None: The element to read, or None if the page should be read whole.
+        """
+        # Imported here so runs that never start a browser don't load selenium.webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        def match(selectors):
+            for selector in selectors:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+                if len(elements) == 1:
+                    return elements[0]
+                if elements:
+                    return "loaded" # Not a container: its first match would hold a single item
+            return None
+
+        def ready(driver):
+            found = match(ready_selectors[:1])
+            if found is not None:
+                return found
+            if driver.execute_script("return document.readyState") != "complete":
+                return False
+            # No content container (e.g. past the last page): fall back once loading is done
+            return match(ready_selectors[1:]) or "loaded"
+
+        try:
+            found = WebDriverWait(driver, config.ELEMENT_WAIT_TIMEOUT).until(ready)
+        except TimeoutException:
+            found = match(ready_selectors)
+        return None if found is None or found == "loaded" else found
+
+    def fetch(self, url, is_complete=None, ready_selectors=None):
+        driver = self._borrow_driver()
+        try:
+            with metrics.timer("driver_get_seconds"):
+                driver.get(url)
+            element = None
+            if self.fast and ready_selectors:
+                with metrics.timer("ready_wait_seconds"):
+                    element = self._wait_ready(driver, ready_selectors)
+            with metrics.timer("page_source_seconds"):
+                # The content element alone is much smaller to serialize, transfer and parse
+                html_content = element.get_attribute("outerHTML") if element is not None else driver.page_source
+        except TimeoutException:
+            metrics.inc("fetch_timeouts_total", backend=self.name)
+            raise
+        finally:
+            self._idle_drivers.put(driver)
+        self._count(self.name)
+        metrics.inc("pages_fetched_total", backend=self.name)
+        metrics.inc("fetched_bytes_total", len(html_content.encode("utf-8")), backend=self.name)
+        return html_content
+
+    def close(self):
+        """Closes every WebDriver in the pool."""
+        while self._drivers:
+            driver = self._drivers.pop()
+            try:
+                driver.quit()
+                logging.info("WebDriver closed successfully.")
+            except Exception as e:
+                logging.error(f"Error closing WebDriver: {e}")
+
+
+class AutoFetcher(Fetcher):
+    """Serves pages over HTTP and escalates to Selenium only when needed.
+
+    A page is escalated when it fails the completeness check (by default:
+    `parser.parse_job_listings` finds no jobs), or when the body of an HTTP
+    error looks like a JavaScript/CAPTCHA challenge. Complete pages are kept
+    even if they mention JavaScript or a captcha (e.g. a <noscript> banner). Timeouts,
+    connection errors and retryable statuses (429/5xx) are raised as they are,
+    so the caller's retry loop backs off and tries again instead of loading
+    the error page in a browser. If the browser cannot be started, the HTTP
+    responses are returned as they are for the rest of the run.
+    """
+
+    name = "auto"
+
+    def __init__(self, http_fetcher, selenium_fetcher):
+        super().__init__()
+        self.http = http_fetcher
+        self.selenium = selenium_fetcher
+        self.browser_error = None # Set once a WebDriver failed to start
+
+    def fetch(self, url, is_complete=None, ready_selectors=None):
+        is_complete = is_complete or has_job_listings
+        try:
+            html_content = self.http.fetch(url)
+        except requests.HTTPError as e:
+            html_content = None
+            response = e.response
+            if response is None or response.status_code in RETRY_STATUSES or not looks_like_challenge(response.text):
+                raise # Overload or a plain error: a browser would get the same answer
+            logging.info(f"HTTP {response.status_code} for {url} is a JS challenge. Escalating to Selenium.")
+        else:
+            # Pages with real content may still mention JavaScript/captcha in their chrome
+            if is_complete(html_content):
+                self._count(self.http.name)
+                return html_content
+            if looks_like_challenge(html_content):
+                logging.info(f"HTTP response for {url} looks like a JS challenge. Escalating to Selenium.")
+            else:
+                logging.info(f"HTTP response for {url} is missing expected content. Escalating to Selenium.")
+        if self.browser_error is None:
+            self._count("escalated")
+            metrics.inc("fetch_retries_total", reason="escalated")
+            try:
+                browser_html = self.selenium.fetch(url, is_complete, ready_selectors)
+            except BrowserUnavailableError as e:
+                logging.warning(f"Escalation to Selenium failed ({e.msg}). Using the HTTP responses as they are for the rest of the run.")
+                self.browser_error = e
+            else:
+                self._count(self.selenium.name)
+                return browser_html
+        if html_content is None:
+            raise BlockedPageError(f"{url} needs a browser, which could not be started.") from self.browser_error
+        self._count(self.http.name)
+        return html_content
+
+    def close(self):
+        self.http.close()
+        self.selenium.close()
+
+
+BACKENDS = ("http", "selenium", "auto")
+
+
+def create_fetcher(backend, driver_factory, pool_size=None):
+    """Builds the fetcher for a backend name.
+
+    Args:
+        backend (str): One of "http", "selenium" or "auto".
+        driver_factory (callable): Returns a new WebDriver (used by selenium/auto).
+        pool_size (int, optional): Connection/driver pool size. Defaults to config.MAX_WORKERS.
+
+    Returns:
+        Fetcher: The configured fetcher.
+    """
+    if backend == "http":
+        return HttpFetcher(pool_size)
+    if backend == "selenium":
+        return SeleniumFetcher(driver_factory, pool_size)
+    if backend == "auto":
+        return AutoFetcher(HttpFetcher(pool_size), SeleniumFetcher(driver_factory, pool_size))
+    raise ValueError(f"Unknown fetch backend: {backend!r}. Expected one of {', '.join(BACKENDS)}.")
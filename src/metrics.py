@@ -0,0 +1,256 @@
+# Run metrics for the Advanced Job Scraper
+#
+# A small, thread-safe registry of counters and timers (histograms) recorded
+# around start-up (imports, WebDriver launch) and the hot paths: rate limiting,
+# network fetches, browser rendering, parsing and saving. Every metric belongs to a stage, so a run summary shows
+# whether time went to the network, the browser, the parser or the disk.
+# Metrics are exported in the Prometheus text format (optionally served over
+# HTTP while the scraper runs) and as a JSON run summary.
+
+import functools
+import http.server
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+PREFIX = "job_scraper_"
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Metric name -> (type, help text, stage)
+METRICS = {
+    "import_seconds": ("histogram", "Time spent importing main.py's modules and lazily imported dependencies.", "startup"),
+    "driver_init_seconds": ("histogram", "Time spent starting WebDriver sessions, by step (chromedriver resolution, browser launch).", "startup"),
+    "rate_limit_wait_seconds": ("histogram", "Time spent waiting for the per-host rate limiter.", "throttle"),
+    "http_fetch_seconds": ("histogram", "Duration of HTTP page requests, including the body download.", "network"),
+    "driver_get_seconds": ("histogram", "Duration of WebDriver page loads (driver.get).", "render"),
+    "ready_wait_seconds": ("histogram", "Time spent waiting for ready selectors after driver.get (fast browser mode).", "render"),
+    "page_source_seconds": ("histogram", "Time spent reading driver.page_source or the content element's outerHTML.", "render"),
+    "parse_seconds": ("histogram", "Duration of parser entry points.", "parse"),
+    "save_seconds": ("histogram", "Duration of whole-file saves in utils.", "disk"),
+    "sink_write_seconds": ("histogram", "Time spent encoding and writing batches to output sinks.", "disk"),
+    "fetched_bytes_total": ("counter", "Bytes of HTML received, by backend.", None),
+    "pages_fetched_total": ("counter", "Pages served, by backend.", None),
+    "fetch_timeouts_total": ("counter", "Page loads that timed out, by backend.", None),
+    "fetch_retries_total": ("counter", "Page loads that were retried, by reason.", None),
+    "parser_selector_path_total": ("counter", "Search pages parsed, by the job card selector path that matched.", None),
+    "jobs_parsed_total": ("counter", "Job listings extracted from search pages.", None),
+    "rate_backoffs_total": ("counter", "Times a host's request rate was cut after a timeout, 429/503 or CAPTCHA.", None),
+    "host_request_rate": ("gauge", "Current adaptive request rate per host, in requests per second.", None),
+}
+
+STAGES = ("startup", "throttle", "network", "render", "parse", "disk")
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and timing histograms."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._counters = {} # name -> {label key: value}
+        self._gauges = {} # name -> {label key: value}
+        self._timers = {} # name -> {label key: [bucket counts, count, sum, max]}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        """Adds `amount` to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """Sets a gauge to its current value."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name, seconds, **labels):
+        """Records one duration in a timer."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._timers.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [[0] * len(self.buckets), 0, 0.0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += 1
+            state[2] += seconds
+            state[3] = max(state[3], seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Context manager recording the duration of its block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator recording the duration of every call to the decorated function."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def export_counters(self):
+        """Returns every counter series as (name, labels, value) tuples, e.g. to send them from a worker process."""
+        with self._lock:
+            return [(name, dict(key), value) for name, series in self._counters.items() for key, value in series.items()]
+
+    def merge_counters(self, counters):
+        """Adds counter series returned by another registry's `export_counters`."""
+        for name, labels, value in counters:
+            self.inc(name, value, **labels)
+
+    def reset(self):
+        """Clears every metric and restarts the run clock."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+            self.started_at = time.time()
+
+    def render_prometheus(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._gauges) | set(self._timers)):
+                metric_type, help_text, _ = METRICS.get(name, ("untyped", name, None))
+                full_name = PREFIX + name
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {metric_type}")
+                for series in (self._counters.get(name, {}), self._gauges.get(name, {})):
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{full_name}{_format_labels(key)} {value}")
+                for key, (bucket_counts, count, total, _) in sorted(self._timers.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets, bucket_counts):
+                        cumulative += bucket_count
+                        lines.append(f"{full_name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                    lines.append(f"{full_name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {total:.6f}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def stage_seconds(self):
+        """Returns the total time recorded per stage (startup, throttle, network, render, parse, disk)."""
+        totals = dict.fromkeys(STAGES, 0.0)
+        with self._lock:
+            for name, series in self._timers.items():
+                stage = METRICS.get(name, (None, None, None))[2]
+                if stage:
+                    totals[stage] += sum(state[2] for state in series.values())
+        return totals
+
+    def summary(self):
+        """Returns a JSON-serializable summary of the run's counters, timers and stage totals."""
+        def series_name(key):
+            return ",".join(f"{name}={value}" for name, value in key) or "total"
+
+        stages = self.stage_seconds()
+        with self._lock:
+            counters = {name: {series_name(key): value for key, value in series.items()}
+                        for name, series in self._counters.items()}
+            gauges = {name: {series_name(key): value for key, value in series.items()}
+                      for name, series in self._gauges.items()}
+            timers = {name: {series_name(key): {"count": count, "total_s": round(total, 6),
+                                                "mean_s": round(total / count, 6) if count else 0.0,
+                                                "max_s": round(longest, 6)}
+                             for key, (_, count, total, longest) in series.items()}
+                      for name, series in self._timers.items()}
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "duration_s": round(time.time() - self.started_at, 3),
+            "stages_s": {stage: round(seconds, 6) for stage, seconds in stages.items()},
+            "counters": counters,
+            "gauges": gauges,
+            "timers": timers,
+        }
+
+
+# Process-wide registry used by the scraper modules
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+set_gauge = REGISTRY.set_gauge
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+
+def write_summary(path, registry=REGISTRY, **extra):
+    """Writes the JSON run summary, with any `extra` top-level fields, to `path`."""
+    summary = registry.summary()
+    summary.update(extra)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=4)
+        logging.info(f"Run metrics saved to {path}")
+    except Exception as e:
+        logging.error(f"Error saving run metrics to {path}: {e}")
+
+
+def log_stage_report(registry=REGISTRY):
+    """Logs where the run's time went, per stage."""
+    stages = registry.stage_seconds()
+    logging.info("Time by stage: " + ", ".join(f"{stage} {seconds:.2f} s" for stage, seconds in stages.items()))
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        payload = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass # Scrapes of the endpoint would flood the scraper log
+
+
+def start_http_server(port, host="", registry=REGISTRY):
+    """Serves the Prometheus text endpoint (/metrics) on a background thread.
+
+    Args:
+        port (int): Port to listen on (0 picks a free port).
+        host (str): Interface to bind. Defaults to all interfaces.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+    """
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logging.info(f"Serving Prometheus metrics on port {server.server_address[1]} (/metrics)")
+    return server
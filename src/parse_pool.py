@@ -0,0 +1,159 @@
+# Process-pool parsing for the Advanced Job Scraper
+#
+# BeautifulSoup tree building and walking is CPU-bound pure Python, so parser
+# threads all share one core under the GIL and slow down the threads driving
+# the fetches. A ParsePool sends raw HTML to a pool of warm worker processes
+# (parser and tree builder already imported) and gets the compact job records
+# back, so parsing scales across cores. Pages can be handed over through
+# shared memory instead of being pickled through the pool's pipe.
+#
+# Worker log records are forwarded to the parent's handlers, and the parse
+# time and counters each worker records are merged into the parent's metrics.
+
+import logging
+import logging.handlers
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from . import config
+from . import metrics
+from . import parser
+
+# Parser entry points a pool may run; each takes the page HTML as its first argument
+PARSE_FUNCTIONS = ("parse_job_listings", "parse_search_page", "parse_job_details", "find_next_page_url")
+
+
+def _init_worker(log_queue, log_level):
+    """Runs once in every worker process: routes logging to the parent and warms up the parser."""
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(log_level)
+    parser.make_soup("<html><body><div class='job_'></div></body></html>") # Load the tree builder
+
+
+def _parse(func_name, html_content, args):
+    """Runs a parser entry point in a worker and returns (result, seconds, counter series)."""
+    metrics.REGISTRY.reset()
+    start = time.perf_counter()
+    result = getattr(parser, func_name)(html_content, *args)
+    return result, time.perf_counter() - start, metrics.REGISTRY.export_counters()
+
+
+def _parse_shared(func_name, shm_name, size, args):
+    """Like `_parse`, but reads the UTF-8 page from a shared memory block created by the parent."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        html_content = bytes(shm.buf[:size]).decode("utf-8")
+    finally:
+        shm.close() # The parent unlinks the block once the result is back
+    return _parse(func_name, html_content, args)
+
+
+class ParsePool:
+    """Pool of warm worker processes exposing the same parse functions as `parser`.
+
+    `parse_job_listings`, `parse_search_page` and `parse_job_details` block until
+    the page is parsed, so a ParsePool can stand in for the `parser` module
+    wherever pages are parsed from worker threads.
+    """
+
+    def __init__(self, processes=None, use_shared_memory=None):
+        """
+        Args:
+            processes (int, optional): Worker processes. Defaults to config.PARSE_PROCESSES.
+            use_shared_memory (bool, optional): Hand pages to the workers through shared memory
+                instead of pickling them. Defaults to config.PARSE_SHARED_MEMORY.
+        """
+        self.workers = processes or config.PARSE_PROCESSES or multiprocessing.cpu_count()
+        self.use_shared_memory = config.PARSE_SHARED_MEMORY if use_shared_memory is None else use_shared_memory
+        # "spawn" children don't inherit the parent's threads and locks (WebDriver pool, metrics server)
+        context = multiprocessing.get_context("spawn")
+        self._log_queue = context.Queue()
+        self._log_listener = logging.handlers.QueueListener(self._log_queue, *logging.getLogger().handlers,
+                                                            respect_handler_level=True)
+        self._log_listener.start()
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self._log_queue, logging.getLogger().getEffectiveLevel()))
+        # Start every worker now so the first pages don't pay for interpreter startup and imports
+        for future in [self._executor.submit(time.sleep, 0.05) for _ in range(self.workers)]:
+            future.result()
+        logging.info(f"Parse pool started with {self.workers} worker process(es)"
+                     f"{' (shared memory)' if self.use_shared_memory else ''}.")
+
+    def submit(self, func_name, html_content, *args):
+        """Starts parsing a page in a worker process.
+
+        Args:
+            func_name (str): One of PARSE_FUNCTIONS.
+            html_content (str): The page HTML.
+            *args: Further arguments of the parse function (e.g. `base_url`).
+
+        Returns:
+            tuple: A handle to pass to `result`.
+        """
+        if func_name not in PARSE_FUNCTIONS:
+            raise ValueError(f"Unknown parse function: {func_name}")
+        if not self.use_shared_memory:
+            return func_name, None, self._executor.submit(_parse, func_name, html_content, args)
+        data = html_content.encode("utf-8")
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+        try:
+            future = self._executor.submit(_parse_shared, func_name, shm.name, len(data), args)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        return func_name, shm, future
+
+    def result(self, handle):
+        """Waits for a page started with `submit` and returns what the parse function returned."""
+        func_name, shm, future = handle
+        try:
+            result, seconds, counters = future.result()
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        metrics.observe("parse_seconds", seconds, function=func_name)
+        metrics.REGISTRY.merge_counters(counters)
+        return result
+
+    def map(self, func_name, pages, *args):
+        """Parses many pages across the pool, yielding the results in order.
+
+        At most two pages per worker are in flight, which bounds the memory held in
+        pickled or shared pages.
+        """
+        pending = []
+        for html_content in pages:
+            pending.append(self.submit(func_name, html_content, *args))
+            if len(pending) >= 2 * self.workers:
+                yield self.result(pending.pop(0))
+        for handle in pending:
+            yield self.result(handle)
+
+    def parse_job_listings(self, html_content):
+        """Process-pool version of `parser.parse_job_listings`."""
+        return self.result(self.submit("parse_job_listings", html_content))
+
+    def parse_search_page(self, html_content, base_url):
+        """Process-pool version of `parser.parse_search_page`."""
+        return self.result(self.submit("parse_search_page", html_content, base_url))
+
+    def parse_job_details(self, html_content):
+        """Process-pool version of `parser.parse_job_details`."""
+        return self.result(self.submit("parse_job_details", html_content))
+
+    def close(self):
+        """Shuts the worker processes down."""
+        self._executor.shutdown()
+        self._log_listener.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,100 +1,190 @@
 import logging
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import re
 
+from . import metrics
+from .records import JobPosting, LISTING_FIELDS
+
 # These might need adjustment based on the specific website structure and changes over time.
 
-def parse_job_listings(html_content):
-    """Parses the main job listings page to extract individual job links or basic info.
+# Use the C-accelerated lxml tree builder when it is installed; it builds the
+# same tree several times faster than the pure-Python "html.parser".
+try:
+    import lxml # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Keys of every record produced by parse_job_listings, in output order
+JOB_FIELDS = LISTING_FIELDS
+
+# Precompiled selectors, shared by every call
+JOB_CARD_RE = re.compile(r"job_") # Example selector, adjust as needed
+JOB_LINK_RE = re.compile(r"/rc/clk|/clk|/viewjob", re.IGNORECASE)
+TITLE_RE = re.compile(r"title", re.IGNORECASE)
+COMPANY_RE = re.compile(r"company", re.IGNORECASE)
+LOCATION_RE = re.compile(r"location", re.IGNORECASE)
+SUMMARY_RE = re.compile(r"summary", re.IGNORECASE)
+DATE_RE = re.compile(r"date", re.IGNORECASE)
+NEXT_TEXT_RE = re.compile(r"Next", re.IGNORECASE)
+DESCRIPTION_ID_RE = re.compile(r"jobDescriptionText", re.IGNORECASE)
+DESCRIPTION_CLASS_RE = re.compile(r"description", re.IGNORECASE)
+
+def make_soup(html_content):
+    """Builds a BeautifulSoup tree with the fastest available parser."""
+    return BeautifulSoup(html_content, HTML_PARSER)
+
+def _class_matches(tag, pattern):
+    """Mirrors BeautifulSoup's `class_=<regex>` matching for a single tag."""
+    classes = tag.get("class")
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return bool(pattern.search(classes))
+    return any(pattern.search(cls) for cls in classes) or bool(pattern.search(" ".join(classes)))
+
+def _is_generic_job_div(tag):
+    """Fallback card selector: any div with "job" in one of its classes."""
+    return tag.name == "div" and tag.has_attr("class") and any("job" in cls for cls in tag["class"])
+
+def _extract_card(card):
+    """Extracts the listing fields from a job card in a single walk over its subtree.
+
+    Each field takes the first matching descendant in document order, exactly
+    like the chained `card.find(...)` lookups it replaces.
+    """
+    title_h2 = title_link = company = location_div = location_span = summary = date = url_link = None
+    for tag in card.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        name = tag.name
+        if name == "a":
+            if title_link is None and tag.get("data-jobid") is not None:
+                title_link = tag
+            if url_link is None and tag.get("href") is not None:
+                url_link = tag
+        elif name == "span":
+            if company is None and _class_matches(tag, COMPANY_RE):
+                company = tag
+            if location_span is None and _class_matches(tag, LOCATION_RE):
+                location_span = tag
+            if date is None and _class_matches(tag, DATE_RE):
+                date = tag
+        elif name == "div":
+            if location_div is None and _class_matches(tag, LOCATION_RE):
+                location_div = tag
+            if summary is None and _class_matches(tag, SUMMARY_RE):
+                summary = tag
+        elif name == "h2":
+            if title_h2 is None and _class_matches(tag, TITLE_RE):
+                title_h2 = tag
+
+    title_element = title_h2 or title_link
+    location_element = location_div or location_span
+    job_url = url_link["href"] if url_link else "N/A"
+    # Construct absolute URL if relative (Example for Indeed)
+    if job_url.startswith("/"):
+        job_url = f"https://www.indeed.com{job_url}"
+    return JobPosting(
+        title=title_element.get_text(strip=True) if title_element else "N/A",
+        company=company.get_text(strip=True) if company else "N/A",
+        location=location_element.get_text(strip=True) if location_element else "N/A",
+        summary=summary.get_text(strip=True) if summary else "N/A",
+        date_posted=date.get_text(strip=True) if date else "N/A",
+        url=job_url
+    )
+
+def extract_job_listings(soup):
+    """Extracts job listings from an already parsed search results page.
 
     Args:
-        html_content (str): The HTML content of the search results page.
+        soup (BeautifulSoup): The parsed search results page.
 
     Returns:
-        list: A list of dictionaries, each containing basic info for a job found on the page.
-              (e.g., title, company, location, summary snippet, URL)
+        list: A list of `JobPosting` records, each containing basic info for a job found on the page.
     """
-    soup = BeautifulSoup(html_content, \'html.parser\")
-    job_cards = soup.find_all(\"div\", class_=re.compile(r\"job_\")) # Example selector, adjust as needed
-    # Alternative: soup.select(\"[data-tn-component=\"jobHeader\"]\") or similar specific selectors
+    job_cards = soup.find_all("div", class_=JOB_CARD_RE)
+    # Alternative: soup.select('[data-tn-component="jobHeader"]') or similar specific selectors
 
     jobs_data = []
+    selector_path = "primary"
     if not job_cards:
         # Try finding job cards using a more general approach if specific classes fail
-        job_cards = soup.find_all(lambda tag: tag.name == \"div\" and tag.has_attr(\"class\") and any(\"job\" in cls for cls in tag[\"class\"])) 
+        job_cards = soup.find_all(_is_generic_job_div)
+        selector_path = "generic"
         # Add more fallback selectors if necessary
         if not job_cards:
-            logging.warning(\"Could not find job card elements using primary or secondary selectors.\")
+            logging.warning("Could not find job card elements using primary or secondary selectors.")
             # Look for clickable links that might be jobs
-            job_links = soup.find_all(\"a\", href=re.compile(r\"/rc/clk|/clk|/viewjob\", re.IGNORECASE))
+            job_links = soup.find_all("a", href=JOB_LINK_RE)
             if job_links:
-                logging.info(f\"Found {len(job_links)} potential job links as fallback.\")
+                logging.info(f"Found {len(job_links)} potential job links as fallback.")
                 # Simplified extraction if only links are found
                 for link in job_links:
-                    job_title = link.get_text(strip=True) or \"N/A\"
-                    job_url = link.get(\"href\")
+                    job_title = link.get_text(strip=True) or "N/A"
+                    job_url = link.get("href")
                     # Attempt to construct absolute URL if relative
-                    if job_url and not job_url.startswith(\"http\"):
+                    if job_url and not job_url.startswith("http"):
                         # This needs the base URL from config or context, simplified here
-                        job_url = f\"https://www.indeed.com{job_url}\" # Example, make dynamic
+                        job_url = f"https://www.indeed.com{job_url}" # Example, make dynamic
                     if job_url:
-                        jobs_data.append({
-                            \"title\": job_title,
-                            \"company\": \"N/A\",
-                            \"location\": \"N/A\",
-                            \"summary\": \"N/A\",
-                            \"date_posted\": \"N/A\",
-                            \"url\": job_url
-                        })
+                        jobs_data.append(JobPosting(title=job_title, url=job_url))
+                metrics.inc("parser_selector_path_total", path="links")
+                metrics.inc("jobs_parsed_total", len(jobs_data))
                 return jobs_data
             else:
-                logging.error(\"Failed to find any job card elements or potential job links.\")
+                logging.error("Failed to find any job card elements or potential job links.")
+                metrics.inc("parser_selector_path_total", path="none")
                 return []
 
     logging.info(f"Found {len(job_cards)} potential job card elements.")
 
     for card in job_cards:
         try:
-            title_element = card.find(\"h2\", class_=re.compile(r\"title\", re.IGNORECASE)) or card.find(\"a\", attrs={\"data-jobid\": True})
-            job_title = title_element.get_text(strip=True) if title_element else \"N/A\"
-
-            company_element = card.find(\"span\", class_=re.compile(r\"company\", re.IGNORECASE))
-            job_company = company_element.get_text(strip=True) if company_element else \"N/A\"
-
-            location_element = card.find(\"div\", class_=re.compile(r\"location\", re.IGNORECASE)) or card.find(\"span\", class_=re.compile(r\"location\", re.IGNORECASE))
-            job_location = location_element.get_text(strip=True) if location_element else \"N/A\"
-
-            summary_element = card.find(\"div\", class_=re.compile(r\"summary\", re.IGNORECASE))
-            job_summary = summary_element.get_text(strip=True) if summary_element else \"N/A\"
-
-            date_element = card.find(\"span\", class_=re.compile(r\"date\", re.IGNORECASE))
-            job_date = date_element.get_text(strip=True) if date_element else \"N/A\"
-
-            url_element = card.find(\"a\", href=True)
-            job_url = url_element[\"href\"] if url_element else \"N/A\"
-            # Construct absolute URL if relative (Example for Indeed)
-            if job_url.startswith(\"/\"):
-                job_url = f\"https://www.indeed.com{job_url}\"
-
-            if job_title != \"N/A\" and job_url != \"N/A\": # Basic validation
-                jobs_data.append({
-                    \"title\": job_title,
-                    \"company\": job_company,
-                    \"location\": job_location,
-                    \"summary\": job_summary,
-                    \"date_posted\": job_date,
-                    \"url\": job_url
-                })
+            job = _extract_card(card)
+            if job["title"] != "N/A" and job["url"] != "N/A": # Basic validation
+                jobs_data.append(job)
             else:
-                logging.debug(f\"Skipping card due to missing title or URL: {card.prettify()[:200]}...\")
+                logging.debug(f"Skipping card due to missing title or URL: {card.prettify()[:200]}...")
 
         except Exception as e:
-            logging.warning(f\"Error parsing a job card: {e}. Card content: {card.prettify()[:200]}...\")
+            logging.warning(f"Error parsing a job card: {e}. Card content: {card.prettify()[:200]}...")
             continue
 
     logging.info(f"Successfully parsed {len(jobs_data)} job listings from the page.")
+    metrics.inc("parser_selector_path_total", path=selector_path)
+    metrics.inc("jobs_parsed_total", len(jobs_data))
     return jobs_data
 
+@metrics.timed("parse_seconds", function="parse_job_listings")
+def parse_job_listings(html_content):
+    """Parses the main job listings page to extract individual job links or basic info.
+
+    Args:
+        html_content (str): The HTML content of the search results page.
+
+    Returns:
+        list: A list of `JobPosting` records (mapping-compatible, like dicts), each containing
+              basic info for a job found on the page (e.g., title, company, location, summary snippet, URL)
+    """
+    return extract_job_listings(make_soup(html_content))
+
+@metrics.timed("parse_seconds", function="parse_search_page")
+def parse_search_page(html_content, base_url):
+    """Parses a search results page once and extracts both the listings and the next page link.
+
+    Args:
+        html_content (str): The HTML content of the search results page.
+        base_url (str): The base URL of the job site (e.g., https://www.indeed.com)
+
+    Returns:
+        tuple: (jobs_data, next_page_url) as returned by `parse_job_listings`
+               and `find_next_page_url`.
+    """
+    soup = make_soup(html_content)
+    return extract_job_listings(soup), extract_next_page_url(soup, base_url)
+
+@metrics.timed("parse_seconds", function="parse_job_details")
 def parse_job_details(html_content):
     """Parses the detailed job description page.
 
@@ -105,60 +195,71 @@ def parse_job_details(html_content):
         dict: A dictionary containing detailed job information (e.g., full description).
               This can be expanded to extract more specific details if needed.
     """
-    soup = BeautifulSoup(html_content, \'html.parser\")
+    soup = make_soup(html_content)
     details = {}
 
     # Example: Extracting the full job description
     # Adjust selector based on the target website
-    description_container = soup.find(\"div\", id=re.compile(r\"jobDescriptionText\", re.IGNORECASE)) or soup.find(\"div\", class_=re.compile(r\"description\", re.IGNORECASE))
+    description_container = soup.find("div", id=DESCRIPTION_ID_RE) or soup.find("div", class_=DESCRIPTION_CLASS_RE)
     if description_container:
-        details[\"full_description\"] = description_container.get_text(separator=\"\\n\", strip=True)
+        details["full_description"] = description_container.get_text(separator="\n", strip=True)
     else:
-        details[\"full_description\"] = \"N/A\"
-        logging.warning(\"Could not find job description container.\")
+        details["full_description"] = "N/A"
+        logging.warning("Could not find job description container.")
 
     # Add more parsing logic here to extract other details like:
     # - Salary information
     # - Job type (full-time, part-time)
     # - Specific requirements or qualifications
     # Example (highly site-specific):
-    # salary_element = soup.find(\"span\", class_=\"salary-snippet\")
-    # details[\"salary\"] = salary_element.get_text(strip=True) if salary_element else \"N/A\"
+    # salary_element = soup.find("span", class_="salary-snippet")
+    # details["salary"] = salary_element.get_text(strip=True) if salary_element else "N/A"
 
-    logging.info(f"Parsed job details. Description length: {len(details.get(\"full_description\", \"\"))}")
+    logging.info(f"Parsed job details. Description length: {len(details.get('full_description', ''))}")
     return details
 
-def find_next_page_url(html_content, base_url):
-    """Finds the URL for the next page of search results.
+def extract_next_page_url(soup, base_url):
+    """Finds the URL for the next page of search results in an already parsed page.
 
     Args:
-        html_content (str): The HTML content of the current search results page.
+        soup (BeautifulSoup): The parsed search results page.
         base_url (str): The base URL of the job site (e.g., https://www.indeed.com)
 
     Returns:
         str or None: The URL of the next page, or None if not found.
     """
-    soup = BeautifulSoup(html_content, \'html.parser\")
-    # Common patterns for \"Next\" links
-    next_link = soup.find(\"a\", attrs={\"aria-label\": \"Next\"}) or \
-                soup.find(\"a\", string=re.compile(r\"Next\", re.IGNORECASE)) or \
-                soup.find(\"link\", rel=\"next\")
-
-    if next_link and next_link.get(\"href\"):
-        next_href = next_link[\"href\"]
-        if next_href.startswith(\"/\"):
+    # Common patterns for "Next" links
+    next_link = soup.find("a", attrs={"aria-label": "Next"}) or \
+                soup.find("a", string=NEXT_TEXT_RE) or \
+                soup.find("link", rel="next")
+
+    if next_link and next_link.get("href"):
+        next_href = next_link["href"]
+        if next_href.startswith("/"):
             # Ensure no double slashes if base_url ends with /
-            next_url = f\"{base_url.rstrip(\"/\")}{next_href}\"
-        elif next_href.startswith(\"http\"):
+            next_url = f"{base_url.rstrip('/')}{next_href}"
+        elif next_href.startswith("http"):
             next_url = next_href
         else:
             # Handle potentially relative paths differently if needed
-            logging.warning(f\"Found potentially relative next page link: {next_href}. Attempting to join with base URL.\")
-            next_url = f\"{base_url.rstrip(\"/\")}/{next_href.lstrip(\"/\")}\" # Basic joining
+            logging.warning(f"Found potentially relative next page link: {next_href}. Attempting to join with base URL.")
+            next_url = f"{base_url.rstrip('/')}/{next_href.lstrip('/')}" # Basic joining
 
         logging.info(f"Found next page URL: {next_url}")
         return next_url
     else:
-        logging.info(\"No next page link found.\")
+        logging.info("No next page link found.")
         return None
 
+@metrics.timed("parse_seconds", function="find_next_page_url")
+def find_next_page_url(html_content, base_url):
+    """Finds the URL for the next page of search results.
+
+    Args:
+        html_content (str): The HTML content of the current search results page.
+        base_url (str): The base URL of the job site (e.g., https://www.indeed.com)
+
+    Returns:
+        str or None: The URL of the next page, or None if not found.
+    """
+    return extract_next_page_url(make_soup(html_content), base_url)
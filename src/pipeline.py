@@ -0,0 +1,195 @@
+# Asyncio scraping pipeline for the Advanced Job Scraper
+#
+# Stages run concurrently and are connected by bounded queues:
+#
+#   page numbers -> fetch pages -> parse listings -> [fetch + parse details] -> sink
+#
+# Blocking work (network fetches, BeautifulSoup parsing, disk writes) runs in
+# executors so the event loop only shuffles items between queues. Because the
+# queues are bounded, a slow stage applies backpressure to the ones before it
+# instead of letting results pile up in memory.
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from . import config
+
+_DONE = object() # End-of-stream marker passed between stages
+
+
+class ScrapePipeline:
+    """Runs fetch, parse, detail enrichment and sink as overlapping stages."""
+
+    def __init__(self, scraper, sink, enricher=None, queue_size=None, parse_workers=None):
+        """
+        Args:
+            scraper (JobScraper): Provides URL building, fetching and rate limiting.
+            sink (callable): Called with each batch (list) of finished job dicts.
+                Runs on a dedicated writer thread, so batches arrive one at a time.
+            enricher (DetailEnricher, optional): If given, each job's details are merged
+                in by a detail stage running `enricher.max_workers` fetches at once.
+            queue_size (int, optional): Capacity of each inter-stage queue. Defaults to config.PIPELINE_QUEUE_SIZE.
+            parse_workers (int, optional): Parser threads. Defaults to the scraper's parse pool
+                size, or config.PARSE_WORKERS when pages are parsed in-process.
+        """
+        self.scraper = scraper
+        self.sink = sink
+        self.enricher = enricher
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.parse_workers = parse_workers or (scraper.parse_pool.workers if scraper.parse_pool else config.PARSE_WORKERS)
+        self.detail_workers = enricher.max_workers if enricher else 1
+        self.jobs_written = 0
+        self._stop_at = config.MAX_PAGES # First page number past the end of the results
+
+    async def _offload(self, executor, func, *args):
+        """Runs a blocking call in an executor and awaits its result."""
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    async def _run_stage(self, inbox, outbox, workers, handle):
+        """Runs `workers` copies of `handle` over `inbox`, forwarding results to `outbox`.
+
+        `handle` is a coroutine returning an iterable of items for the next stage.
+        When the end-of-stream marker arrives it is handed on to sibling workers,
+        and once every worker has stopped a single marker is sent downstream.
+        """
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE) # Let the sibling workers see it too
+                    return
+                for result in await handle(item):
+                    await outbox.put(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            await outbox.put(_DONE)
+
+    async def _produce_pages(self, outbox):
+        """Feeds page numbers to the fetch stage until the end of the results is known."""
+        try:
+            for page_num in range(config.MAX_PAGES):
+                if page_num == 1 and self.scraper.seen_index is not None:
+                    # Incremental runs usually stop after the first page; don't fetch ahead of it
+                    await self._first_page_done.wait()
+                if page_num >= self._stop_at:
+                    break
+                await outbox.put(page_num)
+        finally:
+            await outbox.put(_DONE)
+
+    async def _fetch_page(self, page_num):
+        if page_num >= self._stop_at:
+            return [] # Past the last page, don't hit the site
+        page_jobs = self.scraper.restore_page(page_num)
+        if page_jobs is not None:
+            return [(page_num, None, page_jobs)] # Journaled by an interrupted run; skip fetch and parse
+        check = self.scraper.listings_check()
+        try:
+            html_content = await self._offload(self._io_executor, self.scraper._fetch_page, page_num, None, None, check)
+        except WebDriverException as e:
+            logging.error(f"WebDriver error on page {page_num + 1}: {e}")
+            self.scraper.interrupted = True
+            self._stop_at = min(self._stop_at, page_num)
+            html_content = None
+        if not html_content:
+            if page_num == 0:
+                self._first_page_done.set()
+            return []
+        return [(page_num, html_content, check)]
+
+    async def _parse_page(self, item):
+        page_num, html_content, parsed = item
+        try:
+            return await self._parse_listings(page_num, html_content, parsed)
+        finally:
+            if page_num == 0:
+                self._first_page_done.set()
+
+    async def _parse_listings(self, page_num, html_content, parsed):
+        if html_content is None:
+            page_jobs = parsed # Journaled by an interrupted run
+        else:
+            # The completeness check has usually parsed the page already (auto backend)
+            page_jobs = await self._offload(self._parse_executor, parsed.result_for, html_content)
+            self.scraper.checkpoint_page(page_num, page_jobs)
+        if not page_jobs:
+            logging.info(f"No jobs found on page {page_num + 1}. Stopping pagination or check selectors.")
+            self._stop_at = min(self._stop_at, page_num)
+            return []
+        if page_num >= self._stop_at:
+            return [] # Result of a page fetched before the end of the results was known
+        logging.info(f"Found {len(page_jobs)} jobs on page {page_num + 1}.")
+        page_jobs = self.scraper.filter_page_jobs(page_num, page_jobs)
+        if page_jobs is None:
+            self._stop_at = min(self._stop_at, page_num + 1)
+            return []
+        return [page_jobs] if page_jobs else []
+
+    async def _enrich_jobs(self, page_jobs):
+        """Fetches and parses the detail page of every job in a batch concurrently."""
+        await asyncio.gather(*(self._enrich_job(job) for job in page_jobs))
+        return [page_jobs]
+
+    async def _enrich_job(self, job):
+        # Cache lookup, fetch and parse all happen on the detail thread
+        await self._offload(self._detail_executor, self.enricher.enrich_job, job)
+
+    async def _write(self, inbox):
+        """Sink stage: hands each finished batch to the sink on the writer thread."""
+        while True:
+            page_jobs = await inbox.get()
+            if page_jobs is _DONE:
+                return
+            await self._offload(self._sink_executor, self.sink, page_jobs)
+            self.jobs_written += len(page_jobs)
+
+    async def run(self):
+        """Runs the pipeline to completion.
+
+        Returns:
+            int: The number of job records handed to the sink.
+        """
+        self._first_page_done = asyncio.Event()
+        pages = asyncio.Queue(self.queue_size)
+        html_pages = asyncio.Queue(self.queue_size)
+        parsed = asyncio.Queue(self.queue_size)
+        stages = [
+            self._produce_pages(pages),
+            self._run_stage(pages, html_pages, self.scraper.max_workers, self._fetch_page),
+            self._run_stage(html_pages, parsed, self.parse_workers, self._parse_page),
+        ]
+        if self.enricher:
+            enriched = asyncio.Queue(self.queue_size)
+            # Each queued batch holds a whole page, so a few in flight keep the detail workers busy
+            stages.append(self._run_stage(parsed, enriched, 2, self._enrich_jobs))
+            stages.append(self._write(enriched))
+        else:
+            stages.append(self._write(parsed))
+
+        with ThreadPoolExecutor(self.scraper.max_workers, thread_name_prefix="fetch") as self._io_executor, \
+             ThreadPoolExecutor(self.detail_workers, thread_name_prefix="detail") as self._detail_executor, \
+             ThreadPoolExecutor(self.parse_workers, thread_name_prefix="parse") as self._parse_executor, \
+             ThreadPoolExecutor(1, thread_name_prefix="sink") as self._sink_executor:
+            await asyncio.gather(*stages)
+
+        logging.info(f"Pipeline finished. Total jobs written: {self.jobs_written}")
+        return self.jobs_written
+
+
+def run_pipeline(scraper, sink, enricher=None):
+    """Runs the asyncio scraping pipeline from synchronous code.
+
+    Args:
+        scraper (JobScraper): The scraper providing fetch backend and URLs.
+        sink (callable): Called with each batch (list) of finished job dicts.
+        enricher (DetailEnricher, optional): Enriches each job with its detail page.
+
+    Returns:
+        int: The number of job records handed to the sink.
+    """
+    return asyncio.run(ScrapePipeline(scraper, sink, enricher=enricher).run())
@@ -0,0 +1,116 @@
+# Compact job records for the Advanced Job Scraper
+#
+# A run can hold many thousands of jobs at once (batch merges, detail
+# enrichment, checkpoints), and a dict per job costs several hundred bytes
+# before its values are counted. JobPosting keeps one slot per schema field
+# instead, shares one "N/A" placeholder for every missing value, and interns
+# the low-cardinality company/location/date strings so repeated values are
+# stored once. It implements the mutable mapping interface, so code written
+# for job dicts (job["url"], job.get(...), job.update(details)) keeps working.
+
+import sys
+from collections.abc import MutableMapping
+
+# Placeholder of every missing field. One shared object: compare with == (or `is`).
+MISSING = "N/A"
+
+# Listing fields produced by parser.parse_job_listings, in output order
+LISTING_FIELDS = ("title", "company", "location", "summary", "date_posted", "url")
+# Fields added by detail enrichment (parser.parse_job_details)
+DETAIL_FIELDS = ("full_description",)
+# Low-cardinality fields whose values are interned
+INTERNED_FIELDS = frozenset(("company", "location", "date_posted"))
+
+_SLOT_FIELDS = frozenset(LISTING_FIELDS + DETAIL_FIELDS)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobPosting(MutableMapping):
+    """A job record with one slot per schema field, usable wherever a job dict is expected.
+
+    Listing fields are always present (MISSING when the page didn't have them).
+    Detail fields are present once set, and any other key is kept in a small
+    overflow dict that is only created when needed.
+    """
+
+    __slots__ = LISTING_FIELDS + DETAIL_FIELDS + ("_extra",)
+
+    def __init__(self, title=MISSING, company=MISSING, location=MISSING, summary=MISSING,
+                 date_posted=MISSING, url=MISSING, **details):
+        """
+        Args:
+            title, company, location, summary, date_posted, url (str): The listing fields.
+            **details: Detail fields (e.g. `full_description`) or any extra fields.
+        """
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.summary = summary
+        self.date_posted = _intern(date_posted)
+        self.url = url
+        self._extra = None
+        for key, value in details.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in _SLOT_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _SLOT_FIELDS:
+            setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _SLOT_FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.__slots__[:-1]:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key in _SLOT_FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in _SLOT_FIELDS:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def row(self, fields):
+        """Returns the values of `fields` as a tuple, with MISSING for absent fields."""
+        return tuple(self.get(field, MISSING) for field in fields)
+
+    def __reduce__(self):
+        # Rebuild through __setitem__ so unpickled values (parse pool results) are interned again
+        return type(self), (), None, None, iter(self.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
@@ -2,27 +2,54 @@
 
 import logging
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from urllib.parse import urlencode
 
 from . import config
+from . import driver_cache
+from . import fetchers
+from . import metrics
 from . import parser
+from . import throttle
 from . import utils
 
 class JobScraper:
-    def __init__(self):
-        """Initializes the JobScraper with WebDriver setup."""
-        self.driver = self._setup_driver()
+    def __init__(self, max_workers=None, backend=None, seen_index=None, deduplicator=None, checkpoint=None,
+                 parse_pool=None):
+        """Initializes the JobScraper with its page fetch backend.
+
+        Args:
+            max_workers (int, optional): Number of concurrent page workers. Defaults to config.MAX_WORKERS.
+            backend (str, optional): Fetch backend, "http", "selenium" or "auto". Defaults to config.FETCH_BACKEND.
+            seen_index (SeenJobsIndex, optional): Enables incremental scraping: only new or changed
+                jobs are returned, and pagination stops at the first page with nothing new.
+            deduplicator (JobDeduplicator, optional): Collapses exact and near-duplicate jobs.
+            checkpoint (CheckpointJournal, optional): Journals every parsed page, and serves the
+                pages already journaled by an interrupted run instead of fetching them again.
+            parse_pool (ParsePool, optional): Parses pages in worker processes instead of the calling thread.
+        """
+        self.max_workers = max(1, max_workers or config.MAX_WORKERS)
+        self.backend = backend or config.FETCH_BACKEND
+        self.seen_index = seen_index
+        self.deduplicator = deduplicator
+        self.checkpoint = checkpoint
+        self.parse_pool = parse_pool
+        self.parser = parse_pool or parser # Anything providing parse_job_listings/parse_job_details
+        self.interrupted = False # Set when a WebDriver error stopped pagination early
+        self.rate_limiter = throttle.create_rate_limiter(config.HOST_RATE_LIMIT)
+        self.detail_rate_limiter = throttle.create_rate_limiter(config.DETAIL_RATE_LIMIT)
+        # WebDriver sessions are only started if the backend actually needs them
+        self.fetcher = fetchers.create_fetcher(self.backend, self._setup_driver, self.max_workers)
         self.all_jobs_data = []
 
     def _setup_driver(self):
         """Sets up the Selenium WebDriver."""
         logging.info("Setting up WebDriver...")
-        chrome_options = Options()
+        # Selenium's WebDriver classes are slow to import; only runs that start a browser pay for them
+        chrome = utils.lazy_import("selenium.webdriver.chrome.webdriver")
+        chrome_options = utils.lazy_import("selenium.webdriver.chrome.options").Options()
         if config.HEADLESS_BROWSE:
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--disable-gpu")
@@ -30,111 +57,318 @@ class JobScraper:
         chrome_options.add_argument("--no-sandbox") # Important for running in restricted environments
         chrome_options.add_argument("--disable-dev-shm-usage") # Overcome limited resource problems
         # Optional: Add user agent to mimic a real browser
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        chrome_options.add_argument(f"user-agent={config.USER_AGENT}")
+        if config.FAST_BROWSER:
+            # Return from driver.get at DOMContentLoaded; readiness is checked with selectors instead
+            chrome_options.page_load_strategy = "eager"
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2, # Block images
+                "profile.default_content_setting_values.notifications": 2,
+            })
 
         try:
-            # Use webdriver-manager to automatically handle driver download/update
-            service = ChromeService(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            # chromedriver is resolved with webdriver-manager once and cached per Chrome version
+            service = utils.lazy_import("selenium.webdriver.chrome.service").Service(driver_cache.resolve_chromedriver())
+            with metrics.timer("driver_init_seconds", step="launch"):
+                driver = chrome.WebDriver(service=service, options=chrome_options)
             driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+            if config.FAST_BROWSER and config.BLOCKED_URL_PATTERNS:
+                # Media and fonts have no content setting; drop those requests at the network layer
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": config.BLOCKED_URL_PATTERNS})
             logging.info("WebDriver setup successful.")
             return driver
         except WebDriverException as e:
             logging.error(f"Failed to initialize WebDriver: {e}")
+            driver_cache.invalidate() # The cached chromedriver may no longer match Chrome
             # Consider adding fallback or specific error handling here
             raise # Re-raise the exception to stop execution if driver fails
         except Exception as e:
             logging.error(f"An unexpected error occurred during WebDriver setup: {e}")
             raise
 
-    def _build_search_url(self, page_num=0):
-        """Builds the search URL for Indeed (example)."""
+    def _build_search_url(self, page_num=0, query=None, location=None):
+        """Builds the search URL for Indeed (example).
+
+        `query` and `location` default to config.SEARCH_QUERY and config.LOCATION.
+        """
         # Indeed uses 'q' for query, 'l' for location, 'start' for pagination (0, 10, 20...)
         params = {
-            \"q\": config.SEARCH_QUERY,
-            \"l\": config.LOCATION,
-            \"start\": page_num * 10 # Indeed uses increments of 10
+            "q": config.SEARCH_QUERY if query is None else query,
+            "l": config.LOCATION if location is None else location,
+            "start": page_num * 10 # Indeed uses increments of 10
         }
         # Add more parameters as needed, e.g., radius, job type filters
-        # params[\"radius\"] = \"50\" # Example: search within 50 miles
-        # params[\"jt\"] = \"fulltime\" # Example: filter for full-time jobs
+        # params["radius"] = "50" # Example: search within 50 miles
+        # params["jt"] = "fulltime" # Example: filter for full-time jobs
 
-        return f\"{config.BASE_URL}?{urlencode(params)}\"
+        return f"{config.BASE_URL}?{urlencode(params)}"
 
-    def scrape_jobs(self):
-        """Main function to scrape job listings across multiple pages."""
-        logging.info(f"Starting job scraping for query: ", config.SEARCH_QUERY, f\" in location: ", config.LOCATION)
+    def _fetch_page(self, page_num, query=None, location=None, is_complete=None):
+        """Fetches the HTML of a single search results page.
+
+        Args:
+            page_num (int): Zero-based results page number.
+            query (str, optional): Search query. Defaults to config.SEARCH_QUERY.
+            location (str, optional): Search location. Defaults to config.LOCATION.
+            is_complete (callable, optional): Completeness check, e.g. the `listings_check`
+                whose parsed jobs the caller reuses. Defaults to `fetchers.has_job_listings`.
+
+        Returns:
+            str or None: The page HTML, or None if the page could not be loaded and was skipped.
+
+        Raises:
+            WebDriverException: On WebDriver errors other than page load timeouts.
+        """
+        page_url = self._build_search_url(page_num, query, location)
+        logging.info(f"Scraping page {page_num + 1}: {page_url}")
+
+        try:
+            html_content = self._fetch_with_retries(page_url, self.rate_limiter, "search", is_complete,
+                                                    ready_selectors=config.SEARCH_READY_SELECTORS)
+        except (TimeoutException, requests.Timeout):
+            logging.warning(f"Page load timed out for {page_url} after {config.MAX_RETRIES} retries. Skipping page.")
+            return None
+        except WebDriverException:
+            raise # Significant WebDriver errors stop the run
+        except Exception as e:
+            logging.error(f"An unexpected error occurred while scraping page {page_num + 1}: {e}")
+            return None
+
+        if not html_content:
+            logging.warning(f"Failed to retrieve HTML content for page {page_num + 1}.")
+            return None
+        return html_content
+
+    def _fetch_with_retries(self, url, rate_limiter, page_type, is_complete=None, ready_selectors=None):
+        """Fetches a page through the rate limiter, retrying failures with jittered exponential backoff.
 
-        current_page_num = 0
-        while current_page_num < config.MAX_PAGES:
-            page_url = self._build_search_url(current_page_num)
-            logging.info(f"Scraping page {current_page_num + 1}: {page_url}")
+        Timeouts, connection errors, HTTP 429/5xx responses and CAPTCHA pages are
+        retried up to config.MAX_RETRIES times. Timeouts, 429/503 and CAPTCHA pages
+        also make the rate limiter back off the host, while healthy responses let
+        it speed up again.
 
+        Args:
+            url (str): The URL to load.
+            rate_limiter (HostRateLimiter): Per-host limiter for this kind of page.
+            page_type (str): "search" or "detail", used to label metrics.
+            is_complete (callable, optional): Predicate telling whether the HTML has the
+                expected content. Defaults to `fetchers.has_job_listings`.
+            ready_selectors (list, optional): CSS selectors of the page's main content (fast browser mode).
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            Exception: The last error once the retries are used up (`fetchers.BlockedPageError`
+                for CAPTCHA pages). WebDriver and non-retryable HTTP errors are raised at once.
+        """
+        is_complete = is_complete or fetchers.has_job_listings
+        attempt = 0
+        while True:
+            metrics.observe("rate_limit_wait_seconds", rate_limiter.wait(url), page=page_type)
+            start = time.monotonic()
+            retry_after = 0.0
             try:
-                self.driver.get(page_url)
-                # Optional: Add explicit waits here if needed for dynamic content
-                # from selenium.webdriver.support.ui import WebDriverWait
-                # from selenium.webdriver.support import expected_conditions as EC
-                # from selenium.webdriver.common.by import By
-                # wait = WebDriverWait(self.driver, config.ELEMENT_WAIT_TIMEOUT)
-                # wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, \"#resultsCol\"))) # Example wait condition
-
-                time.sleep(config.REQUEST_DELAY) # Simple delay
-
-                html_content = self.driver.page_source
-                if not html_content:
-                    logging.warning(f"Failed to retrieve HTML content for page {current_page_num + 1}.")
-                    current_page_num += 1
-                    continue
-
-                page_jobs = parser.parse_job_listings(html_content)
-                if not page_jobs:
-                    logging.info(f"No jobs found on page {current_page_num + 1}. Stopping pagination or check selectors.")
-                    # Decide whether to break or continue based on site behavior
-                    # If a page reliably has no jobs when finished, we can break.
-                    # If it might be an intermittent issue, continuing might be better.
-                    break # Assuming no jobs means end of results for this example
-
-                self.all_jobs_data.extend(page_jobs)
-                logging.info(f"Found {len(page_jobs)} jobs on page {current_page_num + 1}. Total jobs found: {len(self.all_jobs_data)}")
-
-                # Check for next page (optional, as we are using URL parameters for pagination)
-                # next_page_url = parser.find_next_page_url(html_content, config.BASE_URL)
-                # if not next_page_url or current_page_num >= config.MAX_PAGES - 1:
-                #     logging.info(\"No more pages to scrape or max pages reached.\")
-                #     break
-                # else:
-                #     current_page_num += 1 # Increment only if moving to next page via link click
-
-                current_page_num += 1 # Increment page number for URL generation
-
-            except TimeoutException:
-                logging.warning(f"Page load timed out for {page_url}")
-                # Optional: Implement retry logic here
-                current_page_num += 1 # Move to next page attempt
-                continue
-            except WebDriverException as e:
-                logging.error(f"WebDriver error on page {current_page_num + 1}: {e}")
-                # Decide whether to stop or try to continue
-                break # Stop on significant WebDriver errors
-            except Exception as e:
-                logging.error(f"An unexpected error occurred while scraping page {current_page_num + 1}: {e}")
-                # Optional: Add more specific error handling
-                current_page_num += 1 # Try next page
-                continue
+                html_content = self.fetcher.fetch(url, is_complete, ready_selectors)
+            except (TimeoutException, requests.Timeout) as e:
+                rate_limiter.backoff(url)
+                error, reason = e, "timeout"
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in fetchers.RETRY_STATUSES:
+                    raise
+                if status in fetchers.BACKOFF_STATUSES:
+                    rate_limiter.backoff(url)
+                error, reason = e, f"http_{status}"
+                retry_after = fetchers.retry_after_seconds(e.response)
+            except requests.ConnectionError as e:
+                error, reason = e, "connection"
+            else:
+                # Pages with real content may still mention JavaScript/captcha in their chrome
+                if not (fetchers.looks_like_challenge(html_content) and not is_complete(html_content)):
+                    rate_limiter.record_success(url, time.monotonic() - start)
+                    return html_content
+                rate_limiter.backoff(url)
+                error, reason = fetchers.BlockedPageError(f"CAPTCHA or challenge page at {url}"), "challenge"
 
-        logging.info(f"Scraping finished. Total jobs collected: {len(self.all_jobs_data)}")
-        return self.all_jobs_data
+            attempt += 1
+            if attempt > config.MAX_RETRIES:
+                raise error
+            delay = max(retry_after, throttle.backoff_delay(attempt, config.RETRY_BACKOFF_BASE, config.RETRY_BACKOFF_MAX))
+            metrics.inc("fetch_retries_total", reason=reason)
+            logging.warning(f"Fetching {url} failed ({reason}). Retry {attempt} of {config.MAX_RETRIES} in {delay:.1f} s.")
+            time.sleep(delay)
 
-    def close_driver(self):
-        """Closes the Selenium WebDriver."""
-        if self.driver:
+    def listings_check(self):
+        """Returns a search page completeness check that parses with `self.parser` and keeps the jobs."""
+        return fetchers.ParsedPageCheck(self.parser.parse_job_listings)
+
+    def restore_page(self, page_num, query=None, location=None):
+        """Returns the jobs journaled for a page by an interrupted run, or None if it must be scraped."""
+        if self.checkpoint is None:
+            return None
+        page_jobs = self.checkpoint.get_page(config.SEARCH_QUERY if query is None else query,
+                                             config.LOCATION if location is None else location, page_num)
+        if page_jobs is not None:
+            logging.info(f"Page {page_num + 1} restored from checkpoint ({len(page_jobs)} jobs).")
+        return page_jobs
+
+    def checkpoint_page(self, page_num, page_jobs, query=None, location=None):
+        """Journals a parsed page so a resumed run does not scrape it again."""
+        if self.checkpoint is not None:
+            self.checkpoint.record_page(config.SEARCH_QUERY if query is None else query,
+                                        config.LOCATION if location is None else location, page_num, page_jobs)
+
+    def _scrape_page(self, page_num, query=None, location=None):
+        """Fetches and parses a single search results page.
+
+        Args:
+            page_num (int): Zero-based results page number.
+            query (str, optional): Search query. Defaults to config.SEARCH_QUERY.
+            location (str, optional): Search location. Defaults to config.LOCATION.
+
+        Returns:
+            list or None: The parsed jobs (empty if the page has no results),
+                          or None if the page could not be loaded and was skipped.
+        """
+        page_jobs = self.restore_page(page_num, query, location)
+        if page_jobs is not None:
+            return page_jobs
+        check = self.listings_check()
+        html_content = self._fetch_page(page_num, query, location, check)
+        if html_content is None:
+            return None
+        page_jobs = check.result_for(html_content)
+        self.checkpoint_page(page_num, page_jobs, query, location)
+        return page_jobs
+
+    def fetch_job_details(self, job_url, is_complete=None):
+        """Fetches the HTML of a job's detail page through the configured backend.
+
+        Args:
+            job_url (str): The job posting URL produced by `parser.parse_job_listings`.
+            is_complete (callable, optional): Completeness check. Defaults to `fetchers.has_job_details`.
+
+        Returns:
+            str: The HTML content of the detail page.
+        """
+        return self._fetch_with_retries(job_url, self.detail_rate_limiter, "detail",
+                                        is_complete=is_complete or fetchers.has_job_details,
+                                        ready_selectors=config.DETAIL_READY_SELECTORS)
+
+    def scrape_job_details(self, job_url):
+        """Fetches a job's detail page and returns its `parse_job_details` fields, parsing the page once."""
+        check = fetchers.ParsedPageCheck(self.parser.parse_job_details, fetchers.has_description)
+        return check.result_for(self.fetch_job_details(job_url, check))
+
+    def _iter_pages(self):
+        """Scrapes result pages on the worker pool and yields them in page order.
+
+        Up to `max_workers` pages are in flight at once; results are yielded
+        strictly in page order so the merged output matches a sequential run.
+        In incremental mode the window starts at one page and doubles with every
+        page consumed, since a steady-state run usually stops after the first page.
+
+        Yields:
+            tuple: (page_num, page_jobs) for every page that produced jobs.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            next_page = 0
             try:
-                self.driver.quit()
-                logging.info("WebDriver closed successfully.")
-            except Exception as e:
-                logging.error(f"Error closing WebDriver: {e}")
+                for page_num in range(config.MAX_PAGES):
+                    window = self.max_workers
+                    if self.seen_index is not None:
+                        window = min(window, 1 << page_num)
+                    # Keep the pool busy with the next pages while we wait on this one
+                    while next_page < config.MAX_PAGES and len(pending) < window:
+                        pending[next_page] = executor.submit(self._scrape_page, next_page)
+                        next_page += 1
+
+                    try:
+                        page_jobs = pending.pop(page_num).result()
+                    except WebDriverException as e:
+                        logging.error(f"WebDriver error on page {page_num + 1}: {e}")
+                        self.interrupted = True
+                        break # Stop on significant WebDriver errors
+
+                    if page_jobs is None:
+                        continue # Page was skipped, move on to the next one
+                    if not page_jobs:
+                        logging.info(f"No jobs found on page {page_num + 1}. Stopping pagination or check selectors.")
+                        # Assuming no jobs means end of results for this example
+                        break
+
+                    yield page_num, page_jobs
             finally:
-                self.driver = None
+                for future in pending.values():
+                    future.cancel() # Don't load pages past the end of the results
+
+    def filter_page_jobs(self, page_num, page_jobs):
+        """Drops already-seen jobs (incremental mode) and duplicates (dedup mode) from a page.
+
+        Returns:
+            list or None: The remaining jobs, or None if the page held only
+                          already-seen jobs and pagination should stop.
+        """
+        if self.seen_index is not None:
+            fresh_jobs = self.seen_index.filter_new(page_jobs)
+            if not fresh_jobs:
+                logging.info(f"All {len(page_jobs)} jobs on page {page_num + 1} were already seen. Stopping pagination.")
+                return None
+            logging.info(f"{len(fresh_jobs)} of {len(page_jobs)} jobs on page {page_num + 1} are new or changed.")
+            page_jobs = fresh_jobs
+        if self.deduplicator is not None:
+            unique_jobs = self.deduplicator.filter(page_jobs)
+            if len(unique_jobs) < len(page_jobs):
+                logging.info(f"Collapsed {len(page_jobs) - len(unique_jobs)} duplicate jobs on page {page_num + 1}.")
+            page_jobs = unique_jobs
+        return page_jobs
 
+    def iter_job_pages(self):
+        """Scrapes the configured search and yields each page's jobs as soon as they are ready.
 
+        Pages are yielded in page order and nothing is kept in memory, so this
+        is the API to use with streaming sinks on large runs.
+
+        Yields:
+            list: The jobs of one results page (only new/changed and unique ones in
+                  incremental and dedup mode).
+        """
+        logging.info(f"Starting job scraping for query: {config.SEARCH_QUERY} in location: {config.LOCATION} "
+                     f"({self.max_workers} worker(s), {self.backend} backend)")
+
+        total_jobs = 0
+        for page_num, page_jobs in self._iter_pages():
+            page_jobs = self.filter_page_jobs(page_num, page_jobs)
+            if page_jobs is None:
+                break
+            if not page_jobs:
+                continue
+            total_jobs += len(page_jobs)
+            logging.info(f"Found {len(page_jobs)} jobs on page {page_num + 1}. Total jobs found: {total_jobs}")
+            yield page_jobs
+
+        logging.info(f"Scraping finished. Total jobs collected: {total_jobs}")
+        logging.info(f"Pages served per backend: {self.fetcher.get_stats()}")
+
+    def iter_jobs(self):
+        """Yields scraped jobs one at a time (see `iter_job_pages`)."""
+        for page_jobs in self.iter_job_pages():
+            yield from page_jobs
+
+    def scrape_jobs(self):
+        """Main function to scrape job listings across multiple pages."""
+        for page_jobs in self.iter_job_pages():
+            self.all_jobs_data.extend(page_jobs)
+        return self.all_jobs_data
+
+    def close_driver(self):
+        """Closes the fetch backend, including every Selenium WebDriver it started."""
+        if self.fetcher:
+            self.fetcher.close()
+            self.fetcher = None
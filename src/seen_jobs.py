@@ -0,0 +1,88 @@
+# Persistent index of already scraped jobs for incremental runs
+
+import logging
+import sqlite3
+import threading
+import time
+
+from . import config
+from . import utils
+
+
+class SeenJobsIndex:
+    """SQLite-backed index of every job seen by previous runs.
+
+    Jobs are keyed by `utils.normalize_job_id(url)` and store the hash of their
+    listing content, so a posting that was edited is reported as changed.
+    Updates made by `filter_new` only become permanent on `commit()`, which
+    callers should invoke once the emitted records have been saved.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): SQLite file. Defaults to config.SEEN_INDEX_FILENAME in the output directory.
+        """
+        self.path = path or utils.get_output_path(config.SEEN_INDEX_FILENAME)
+        self.stats = {"new": 0, "changed": 0, "seen": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def filter_new(self, jobs):
+        """Returns the jobs that are new or changed since they were last seen, and records them.
+
+        Args:
+            jobs (list): Job records from `parser.parse_job_listings`.
+
+        Returns:
+            list: The new or changed jobs, in their original order.
+        """
+        now = time.time()
+        keyed = [(job, utils.normalize_job_id(job["url"]), utils.job_content_hash(job)) for job in jobs]
+        fresh = []
+        with self._lock:
+            placeholders = ",".join("?" * len(keyed))
+            known = dict(self._conn.execute(
+                f"SELECT job_id, content_hash FROM seen_jobs WHERE job_id IN ({placeholders})",
+                [job_id for _, job_id, _ in keyed],
+            ).fetchall()) if keyed else {}
+
+            for job, job_id, content_hash in keyed:
+                previous_hash = known.get(job_id)
+                if previous_hash == content_hash:
+                    self.stats["seen"] += 1
+                    continue
+                self.stats["changed" if previous_hash else "new"] += 1
+                known[job_id] = content_hash # Duplicates within the batch count once
+                fresh.append(job)
+
+            self._conn.executemany(
+                "INSERT INTO seen_jobs (job_id, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET content_hash = excluded.content_hash, last_seen = excluded.last_seen",
+                [(job_id, content_hash, now, now) for _, job_id, content_hash in keyed],
+            )
+        return fresh
+
+    def commit(self):
+        """Makes the updates from `filter_new` permanent."""
+        with self._lock:
+            self._conn.commit()
+        logging.info(f"Seen jobs index updated: {self.stats['new']} new, {self.stats['changed']} changed, "
+                     f"{self.stats['seen']} already seen.")
+
+    def close(self):
+        """Closes the index, discarding uncommitted updates."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,334 @@
+# Streaming output sinks for the Advanced Job Scraper
+#
+# Sinks receive each page's jobs as soon as they are scraped, so memory stays
+# flat no matter how many pages a run covers. Records are appended to a
+# "<name>.part" file that is renamed over the final file only when the sink is
+# closed, so readers never see a half-written output; if the run crashes, the
+# records written so far survive in the .part file.
+#
+# Every format writes the same explicit job schema (see `schema_fields`), and
+# `FORMATS` is the registry used by config.OUTPUT_FORMATS and --formats.
+
+import csv
+import json
+import logging
+import os
+import time
+
+from . import config
+from . import metrics
+from . import parser
+from . import utils
+from .records import DETAIL_FIELDS, MISSING, JobPosting
+
+FSYNC_POLICIES = ("never", "close", "batch")
+
+# Job schema: the listing fields from parser.parse_job_listings, plus the detail
+# fields added by enrichment (records.DETAIL_FIELDS). All values are strings;
+# "N/A" (records.MISSING) marks missing values.
+# Low-cardinality columns that columnar formats store dictionary-encoded
+DICTIONARY_FIELDS = ("company", "location", "date_posted")
+
+
+def schema_fields(include_details=False):
+    """Returns the ordered field names of the job schema.
+
+    Args:
+        include_details (bool): Include the detail page fields (enriched runs).
+    """
+    return list(parser.JOB_FIELDS) + (list(DETAIL_FIELDS) if include_details else [])
+
+
+def arrow_schema(fields, dictionary=True):
+    """Builds the pyarrow schema for the given job fields.
+
+    Args:
+        fields (list): Schema fields.
+        dictionary (bool): Dictionary-encode the DICTIONARY_FIELDS columns; otherwise all columns are plain strings.
+    """
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field(field, pa.dictionary(pa.int32(), pa.string()) if dictionary and field in DICTIONARY_FIELDS else pa.string(),
+                 nullable=False)
+        for field in fields
+    ])
+
+
+class Sink:
+    """Base class for streaming, append-only output sinks.
+
+    Subclasses implement `_write_batch(rows)` and may extend `_open()` and
+    `_finish()`; the file is created lazily on the first write so an empty run
+    leaves no output. Rows are tuples of the schema field values, read straight
+    from the job records without building an intermediate dict or DataFrame.
+    """
+
+    binary = False
+
+    def __init__(self, filename, fields=None, fsync=None):
+        """
+        Args:
+            filename (str): Output file name, created in the output directory.
+            fields (list, optional): Schema fields to write. Defaults to `schema_fields()`.
+            fsync (str, optional): "never", "close" (default) or "batch" (after every page).
+                Defaults to config.FSYNC_POLICY.
+        """
+        self.path = utils.get_output_path(filename)
+        self.part_path = f"{self.path}.part"
+        self.fields = list(fields or schema_fields())
+        self.fsync = fsync or config.FSYNC_POLICY
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync!r}. Expected one of {', '.join(FSYNC_POLICIES)}.")
+        self.records_written = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+        self._file = None
+
+    def _open(self):
+        """Opens `self.part_path` and writes any header."""
+        if self.binary:
+            self._file = open(self.part_path, "wb")
+        else:
+            self._file = open(self.part_path, "w", encoding="utf-8", newline="")
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def _finish(self):
+        """Writes any trailer before the file is closed."""
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _record_time(self, seconds):
+        self.encode_seconds += seconds
+        metrics.observe("sink_write_seconds", seconds, format=getattr(self, "format", type(self).__name__))
+
+    def _project(self, jobs):
+        fields = self.fields
+        return [job.row(fields) if type(job) is JobPosting else tuple(job.get(field, MISSING) for field in fields)
+                for job in jobs]
+
+    def write(self, jobs):
+        """Appends a batch of job records (typically one page).
+
+        Args:
+            jobs (list): `JobPosting` records (e.g. from `parser.parse_job_listings`) or job dicts.
+        """
+        if not jobs:
+            return
+        start = time.perf_counter()
+        if self._file is None:
+            self._open()
+        self._write_batch(self._project(jobs))
+        self._record_time(time.perf_counter() - start)
+        self.records_written += len(jobs)
+        if self.fsync == "batch":
+            self._sync()
+
+    def close(self):
+        """Finalizes the output: flushes, optionally fsyncs, and atomically renames it into place."""
+        if self._file is None:
+            logging.warning(f"No data written to {self.path}. Output file was not created.")
+            return
+        start = time.perf_counter()
+        self._finish()
+        self._record_time(time.perf_counter() - start)
+        if self.fsync != "never":
+            self._sync()
+        self._file.close()
+        self._file = None
+        os.replace(self.part_path, self.path)
+        self.bytes_written = os.path.getsize(self.path)
+        logging.info(f"{self.records_written} records successfully saved to {self.path}")
+
+    def abort(self):
+        """Closes the output without finalizing it; the partial data stays in the .part file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logging.warning(f"Output left incomplete: {self.records_written} records in {self.part_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvSink(Sink):
+    """Writes CSV rows with a header of the schema fields."""
+
+    def _open(self):
+        super()._open()
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+
+    def _write_batch(self, rows):
+        self._writer.writerows(rows)
+
+
+class JsonLinesSink(Sink):
+    """Writes one JSON object per line."""
+
+    def _write_batch(self, rows):
+        fields = self.fields
+        self._file.writelines(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+class ZstdJsonLinesSink(Sink):
+    """Writes zstd-compressed JSON Lines as a single streaming frame (requires zstandard)."""
+
+    binary = True
+
+    def __init__(self, filename, fields=None, fsync=None):
+        try:
+            import zstandard # noqa: F401
+        except ImportError as e:
+            raise ImportError("Compressed JSON Lines output requires zstandard: pip install zstandard") from e
+        super().__init__(filename, fields, fsync)
+
+    def _open(self):
+        import zstandard
+
+        super()._open()
+        compressor = zstandard.ZstdCompressor(level=config.ZSTD_LEVEL)
+        self._stream = compressor.stream_writer(self._file, closefd=False)
+
+    def _write_batch(self, rows):
+        fields = self.fields
+        self._stream.write("".join(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n"
+                                   for row in rows).encode("utf-8"))
+
+    def _sync(self):
+        import zstandard
+
+        if not self._stream.closed: # After close() the frame is already complete
+            # Push the compressor's buffered data out as a complete block, so what is fsynced decompresses
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        super()._sync()
+
+    def _finish(self):
+        self._stream.close() # Ends the zstd frame; the file itself stays open
+
+
+class JsonArraySink(Sink):
+    """Streams a JSON array in the same layout as `utils.save_to_json` (indent=4)."""
+
+    def _open(self):
+        super()._open()
+        self._file.write("[")
+        self._separator = "\n"
+
+    def _write_batch(self, rows):
+        for row in rows:
+            item = json.dumps(dict(zip(self.fields, row)), ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            self._file.write(f"{self._separator}    {item}")
+            self._separator = ",\n"
+
+    def _finish(self):
+        self._file.write("\n]")
+
+
+class _ArrowSink(Sink):
+    """Shared base for the pyarrow-backed sinks: one record batch per write."""
+
+    binary = True
+    dictionary = True # Dictionary-encode DICTIONARY_FIELDS
+
+    def __init__(self, filename, fields=None, fsync=None):
+        try:
+            import pyarrow # noqa: F401
+        except ImportError as e:
+            raise ImportError(f"{type(self).__name__} output requires pyarrow: pip install pyarrow") from e
+        super().__init__(filename, fields, fsync)
+        self._schema = arrow_schema(self.fields, self.dictionary)
+
+    def _to_table(self, rows):
+        import pyarrow as pa
+
+        return pa.Table.from_pydict(dict(zip(self.fields, map(list, zip(*rows)))), schema=self._schema)
+
+    def _write_batch(self, rows):
+        self._writer.write_table(self._to_table(rows))
+
+    def _finish(self):
+        self._writer.close() # Writes the footer
+
+
+class ParquetSink(_ArrowSink):
+    """Writes one zstd-compressed Parquet row group per batch, dictionary-encoding low-cardinality columns."""
+
+    def _open(self):
+        import pyarrow.parquet as pq
+
+        super()._open()
+        self._writer = pq.ParquetWriter(self._file, self._schema, compression="zstd",
+                                        use_dictionary=[field for field in self.fields if field in DICTIONARY_FIELDS])
+
+
+class ArrowSink(_ArrowSink):
+    """Writes an Arrow IPC file with zstd-compressed buffers, one record batch per write.
+
+    The IPC file format allows a single dictionary per field for the whole file, and
+    every page can bring new companies or locations, so all columns are plain strings
+    here; the zstd buffer compression takes care of the repeated values.
+    """
+
+    dictionary = False
+
+    def _open(self):
+        import pyarrow as pa
+
+        super()._open()
+        self._writer = pa.ipc.new_file(self._file, self._schema,
+                                       options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+
+# Output format registry: format name -> (sink class, config setting holding its file name)
+FORMATS = {
+    "csv": (CsvSink, "OUTPUT_FILENAME_CSV"),
+    "json": (JsonArraySink, "OUTPUT_FILENAME_JSON"),
+    "jsonl": (JsonLinesSink, "OUTPUT_FILENAME_JSONL"),
+    "jsonl.zst": (ZstdJsonLinesSink, "OUTPUT_FILENAME_JSONL_ZST"),
+    "parquet": (ParquetSink, "OUTPUT_FILENAME_PARQUET"),
+    "arrow": (ArrowSink, "OUTPUT_FILENAME_ARROW"),
+}
+
+
+def open_sinks(formats, include_details=False, timestamped=False):
+    """Creates one streaming sink per output format.
+
+    Args:
+        formats (list): Format names from `FORMATS`.
+        include_details (bool): Include the detail page fields in the schema.
+        timestamped (bool): Add the current timestamp to each file name.
+
+    Returns:
+        list: The sinks, in the order of `formats`. Each has a `format` attribute.
+    """
+    fields = schema_fields(include_details)
+    sinks = []
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format: {fmt!r}. Expected one of {', '.join(FORMATS)}.")
+        sink_type, filename_setting = FORMATS[fmt]
+        filename = getattr(config, filename_setting)
+        sink = sink_type(utils.add_timestamp(filename, f".{fmt}") if timestamped else filename, fields)
+        sink.format = fmt
+        sinks.append(sink)
+    return sinks
+
+
+def log_output_report(sinks):
+    """Logs bytes written and encode time per output format, to compare their cost."""
+    for sink in sinks:
+        if sink.records_written:
+            logging.info(f"Output {sink.format:<10} {sink.bytes_written:>12,} bytes "
+                         f"({sink.bytes_written / sink.records_written:,.0f} bytes/record), "
+                         f"encoded in {sink.encode_seconds * 1000:,.1f} ms")
@@ -0,0 +1,179 @@
+# Request throttling helpers for the Advanced Job Scraper
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from . import config
+from . import metrics
+
+
+class HostRateLimiter:
+    """Thread-safe politeness limiter that spaces out requests to the same host.
+
+    Each call to `wait` reserves the next free time slot for the URL's host and
+    sleeps until that slot arrives, so concurrent workers hitting one host are
+    serialized to at most `rate` requests per second while requests to other
+    hosts are not delayed.
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate (float): Maximum requests per second per host. 0 or None disables limiting.
+        """
+        self.min_interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Blocks until a request to the host of `url` is allowed.
+
+        Args:
+            url (str): The URL about to be requested.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        if not self.min_interval:
+            return 0.0
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record_success(self, url, latency):
+        """Reports a healthy response from the host of `url`. The fixed limiter ignores it."""
+
+    def backoff(self, url):
+        """Reports that the host of `url` pushed back. The fixed limiter ignores it."""
+
+
+class _HostState:
+    """Token bucket and AIMD state of one host."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.latency = None # Exponentially weighted moving average, in seconds
+        self.last_decrease = 0.0
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """Per-host token bucket whose rate is tuned with AIMD (additive increase, multiplicative decrease).
+
+    Every host starts at `rate` requests per second. Each healthy response
+    (latency at or below `latency_target`) adds about `increase` requests per
+    second for every second of traffic, up to `max_rate`. A timeout, HTTP 429/503
+    or CAPTCHA page multiplies the rate by `decrease_factor` (at most once per
+    request interval, so a burst of failures counts once) down to `min_rate`,
+    and empties the bucket so the next request waits a full interval.
+    """
+
+    def __init__(self, rate, max_rate, min_rate, increase, decrease_factor, latency_target, burst=1):
+        """
+        Args:
+            rate (float): Starting requests per second per host. 0 or None disables limiting.
+            max_rate (float): Upper bound of the per-host rate.
+            min_rate (float): Lower bound of the per-host rate.
+            increase (float): Requests/sec added per second of healthy responses.
+            decrease_factor (float): Rate multiplier applied when a host pushes back.
+            latency_target (float): Responses slower than this (seconds) don't increase the rate.
+            burst (int): Requests that may be sent back to back after an idle period.
+        """
+        super().__init__(rate)
+        self.initial_rate = rate
+        self.max_rate = max(rate or 0.0, max_rate)
+        self.min_rate = min(rate or 0.0, min_rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.burst = burst
+        self._hosts = {}
+
+    def _host_state(self, url):
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_rate, self.burst)
+        return host, state
+
+    def wait(self, url):
+        if not self.initial_rate:
+            return 0.0
+        with self._lock:
+            _, state = self._host_state(url)
+            now = time.monotonic()
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate) - 1
+            state.updated = now
+            delay = -state.tokens / state.rate if state.tokens < 0 else 0.0 # Negative tokens are reserved slots
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record_success(self, url, latency):
+        if not self.initial_rate:
+            return
+        with self._lock:
+            host, state = self._host_state(url)
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            if state.latency <= self.latency_target:
+                state.rate = min(self.max_rate, state.rate + self.increase / state.rate)
+            rate = state.rate
+        metrics.set_gauge("host_request_rate", rate, host=host)
+
+    def backoff(self, url):
+        if not self.initial_rate:
+            return
+        with self._lock:
+            host, state = self._host_state(url)
+            now = time.monotonic()
+            if now - state.last_decrease < 1.0 / state.rate:
+                return # Already backed off for this burst
+            state.last_decrease = now
+            state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+            state.tokens = min(state.tokens, 0.0)
+            rate = state.rate
+        metrics.inc("rate_backoffs_total", host=host)
+        metrics.set_gauge("host_request_rate", rate, host=host)
+        logging.info(f"Backing off {host}: request rate lowered to {rate:.2f}/s")
+
+    def get_rate(self, url):
+        """Returns the current request rate for the host of `url`."""
+        with self._lock:
+            return self._host_state(url)[1].rate if self.initial_rate else 0.0
+
+
+def create_rate_limiter(rate, adaptive=None):
+    """Builds the per-host rate limiter for a starting rate.
+
+    Args:
+        rate (float): Requests per second per host. 0 or None disables limiting.
+        adaptive (bool, optional): Tune the rate with AIMD. Defaults to config.ADAPTIVE_RATE_LIMIT.
+
+    Returns:
+        HostRateLimiter: An `AdaptiveRateLimiter` or a fixed `HostRateLimiter`.
+    """
+    if adaptive is None:
+        adaptive = config.ADAPTIVE_RATE_LIMIT
+    if not adaptive:
+        return HostRateLimiter(rate)
+    return AdaptiveRateLimiter(rate, config.MAX_HOST_RATE, config.MIN_HOST_RATE, config.RATE_INCREASE,
+                               config.RATE_DECREASE_FACTOR, config.LATENCY_TARGET, config.RATE_LIMIT_BURST)
+
+
+def backoff_delay(attempt, base, cap):
+    """Returns the jittered exponential backoff delay before retry number `attempt` (1-based).
+
+    Uses "full jitter": a uniform random delay between 0 and min(cap, base * 2 ** (attempt - 1)),
+    so workers that failed together don't retry in lockstep.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
@@ -1,10 +1,14 @@
+import importlib
 import logging
 import os
-import pandas as pd
+import sys
 import json
+import hashlib
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs, urlencode
 
 from . import config
+from . import metrics
 
 def setup_logging():
     """Sets up the logging configuration."""
@@ -24,6 +28,58 @@ def setup_logging():
     )
     logging.info("Logging setup complete.")
 
+def lazy_import(module_name):
+    """Imports a heavy optional dependency on first use, recording the import time in the run metrics.
+
+    Keeps pandas, Selenium and webdriver-manager out of the start-up of runs that never use them.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        with metrics.timer("import_seconds", module=module_name):
+            module = importlib.import_module(module_name)
+    return module
+
+def get_output_path(filename):
+    """Returns the path of a file in the output directory, creating the directory if needed."""
+    output_dir = os.path.join(os.path.dirname(__file__), config.OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, filename)
+
+# Query parameters that only carry tracking/session state and never identify a job
+TRACKING_PARAMS = {"from", "vjs", "tk", "advn", "adid", "ad", "sjdu", "acatk", "pub", "camk", "xkcb", "xpse", "xfps"}
+
+def normalize_job_id(url):
+    """Returns a stable identifier for a job posting URL.
+
+    Indeed links to the same posting through several tracking URLs (`/rc/clk`,
+    `/pagead/clk`, `/viewjob`) that all carry the job key in `jk` (or `vjk`).
+    When there is no job key, the URL without tracking parameters is used.
+
+    Args:
+        url (str): The job URL produced by `parser.parse_job_listings`.
+
+    Returns:
+        str: The normalized job ID.
+    """
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    for key in ("jk", "vjk"):
+        if query.get(key):
+            return f"jk:{query[key][0]}"
+    kept = sorted((k, v) for k, values in query.items() if k.lower() not in TRACKING_PARAMS for v in values)
+    path = parsed.path.rstrip("/") or "/"
+    canonical = f"{parsed.netloc.lower()}{path}"
+    return f"url:{canonical}?{urlencode(kept)}" if kept else f"url:{canonical}"
+
+def job_content_hash(job):
+    """Returns a hash of a job's listing content, used to detect changed postings.
+
+    The relative `date_posted` ("3 days ago") is left out since it changes daily.
+    """
+    content = "\x1f".join(str(job.get(key, "N/A")) for key in ("title", "company", "location", "summary"))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+@metrics.timed("save_seconds", format="csv")
 def save_to_csv(data, filename):
     """Saves the scraped data to a CSV file.
 
@@ -31,21 +87,21 @@ def save_to_csv(data, filename):
         data (list): A list of dictionaries, where each dictionary represents a job posting.
         filename (str): The name of the output CSV file.
     """
-    output_dir = os.path.join(os.path.dirname(__file__), config.OUTPUT_DIR)
-    os.makedirs(output_dir, exist_ok=True)
-    filepath = os.path.join(output_dir, filename)
+    filepath = get_output_path(filename)
 
     if not data:
         logging.warning("No data provided to save to CSV.")
         return
 
     try:
+        pd = lazy_import("pandas")
         df = pd.DataFrame(data)
         df.to_csv(filepath, index=False, encoding="utf-8")
         logging.info(f"Data successfully saved to {filepath}")
     except Exception as e:
         logging.error(f"Error saving data to CSV {filepath}: {e}")
 
+@metrics.timed("save_seconds", format="json")
 def save_to_json(data, filename):
     """Saves the scraped data to a JSON file.
 
@@ -53,17 +109,15 @@ def save_to_json(data, filename):
         data (list): A list of dictionaries, where each dictionary represents a job posting.
         filename (str): The name of the output JSON file.
     """
-    output_dir = os.path.join(os.path.dirname(__file__), config.OUTPUT_DIR)
-    os.makedirs(output_dir, exist_ok=True)
-    filepath = os.path.join(output_dir, filename)
+    filepath = get_output_path(filename)
 
     if not data:
         logging.warning("No data provided to save to JSON.")
         return
 
     try:
-        with open(filepath, \'w\', encoding=\'utf-8\') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4, default=dict) # default: JobPosting records
         logging.info(f"Data successfully saved to {filepath}")
     except Exception as e:
         logging.error(f"Error saving data to JSON {filepath}: {e}")
@@ -72,4 +126,19 @@ def get_timestamp_string():
     """Returns the current timestamp as a string for filenames."""
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+def add_timestamp(filename, extension=None):
+    """Inserts the current timestamp before a filename's extension (jobs.csv -> jobs_20240101_120000.csv).
+
+    Args:
+        filename (str): The file name.
+        extension (str, optional): The full extension, for multi-part ones such as
+            ".jsonl.zst" (jobs.jsonl.zst -> jobs_20240101_120000.jsonl.zst). Defaults to
+            the last suffix of `filename`.
+    """
+    if extension and filename.endswith(extension) and len(filename) > len(extension):
+        stem, ext = filename[:-len(extension)], extension
+    else:
+        stem, ext = os.path.splitext(filename)
+    return f"{stem}_{get_timestamp_string()}{ext}"
+
 